@@ -10,7 +10,9 @@ from app.core.config import settings
 from app.core.database import Base
 
 # Import all models so they are registered with Base.metadata
-import app.models  # noqa: F401
+from app.models import load_all
+
+load_all()
 
 config = context.config
 
@@ -18,6 +18,29 @@ branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
 
+# Foreign keys are added after every table exists: (table, column, referent)
+_FOREIGN_KEYS = [
+    ("employees", "organization_id", "organizations"),
+    ("users", "organization_id", "organizations"),
+    ("users", "employee_id", "employees"),
+    ("leave_balances", "organization_id", "organizations"),
+    ("leave_balances", "employee_id", "employees"),
+    ("leave_requests", "organization_id", "organizations"),
+    ("leave_requests", "employee_id", "employees"),
+    ("leave_requests", "approved_by", "users"),
+    ("documents", "organization_id", "organizations"),
+    ("documents", "employee_id", "employees"),
+    ("policy_documents", "organization_id", "organizations"),
+    ("conversations", "organization_id", "organizations"),
+    ("conversations", "employee_id", "employees"),
+    ("messages", "conversation_id", "conversations"),
+    ("alert_configs", "organization_id", "organizations"),
+    ("alert_events", "alert_config_id", "alert_configs"),
+    ("alert_events", "organization_id", "organizations"),
+    ("alert_events", "employee_id", "employees"),
+]
+
+
 def upgrade() -> None:
     # Enable pgvector extension
     op.execute("CREATE EXTENSION IF NOT EXISTS vector")
@@ -37,7 +60,7 @@ def upgrade() -> None:
     op.create_table(
         "employees",
         sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
-        sa.Column("organization_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("organizations.id"), nullable=False),
+        sa.Column("organization_id", postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column("employee_code", sa.String(100), nullable=False),
         sa.Column("full_name", sa.String(255), nullable=False),
         sa.Column("email", sa.String(255), nullable=False),
@@ -53,12 +76,12 @@ def upgrade() -> None:
     op.create_table(
         "users",
         sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
-        sa.Column("organization_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("organizations.id"), nullable=False),
+        sa.Column("organization_id", postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column("email", sa.String(255), unique=True, nullable=False),
         sa.Column("hashed_password", sa.String(255), nullable=False),
         sa.Column("role", sa.String(50), nullable=False, server_default="employee"),
         sa.Column("full_name", sa.String(255), nullable=False),
-        sa.Column("employee_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("employees.id"), nullable=True),
+        sa.Column("employee_id", postgresql.UUID(as_uuid=True), nullable=True),
         sa.Column("is_active", sa.Boolean, server_default="true"),
         sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
     )
@@ -67,8 +90,8 @@ def upgrade() -> None:
     op.create_table(
         "leave_balances",
         sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
-        sa.Column("organization_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("organizations.id"), nullable=False),
-        sa.Column("employee_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("employees.id"), nullable=False),
+        sa.Column("organization_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("employee_id", postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column("leave_type", sa.String(50), nullable=False),
         sa.Column("total_days", sa.Float, nullable=False, server_default="0"),
         sa.Column("used_days", sa.Float, nullable=False, server_default="0"),
@@ -79,14 +102,14 @@ def upgrade() -> None:
     op.create_table(
         "leave_requests",
         sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
-        sa.Column("organization_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("organizations.id"), nullable=False),
-        sa.Column("employee_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("employees.id"), nullable=False),
+        sa.Column("organization_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("employee_id", postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column("leave_type", sa.String(50), nullable=False),
         sa.Column("start_date", sa.Date, nullable=False),
         sa.Column("end_date", sa.Date, nullable=False),
         sa.Column("status", sa.String(50), nullable=False, server_default="pending"),
         sa.Column("reason", sa.Text, nullable=True),
-        sa.Column("approved_by", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("approved_by", postgresql.UUID(as_uuid=True), nullable=True),
         sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
     )
 
@@ -94,8 +117,8 @@ def upgrade() -> None:
     op.create_table(
         "documents",
         sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
-        sa.Column("organization_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("organizations.id"), nullable=False),
-        sa.Column("employee_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("employees.id"), nullable=True),
+        sa.Column("organization_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("employee_id", postgresql.UUID(as_uuid=True), nullable=True),
         sa.Column("document_type", sa.String(50), nullable=False),
         sa.Column("title", sa.String(500), nullable=False),
         sa.Column("file_path", sa.String(1000), nullable=True),
@@ -107,7 +130,7 @@ def upgrade() -> None:
     op.create_table(
         "policy_documents",
         sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
-        sa.Column("organization_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("organizations.id"), nullable=False),
+        sa.Column("organization_id", postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column("title", sa.String(500), nullable=False),
         sa.Column("content", sa.Text, nullable=False),
         sa.Column("category", sa.String(255), nullable=True),
@@ -120,8 +143,8 @@ def upgrade() -> None:
     op.create_table(
         "conversations",
         sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
-        sa.Column("organization_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("organizations.id"), nullable=False),
-        sa.Column("employee_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("employees.id"), nullable=False),
+        sa.Column("organization_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("employee_id", postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column("channel", sa.String(50), nullable=False, server_default="web"),
         sa.Column("status", sa.String(50), nullable=False, server_default="active"),
         sa.Column("started_at", sa.DateTime(timezone=True), nullable=False),
@@ -132,7 +155,7 @@ def upgrade() -> None:
     op.create_table(
         "messages",
         sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
-        sa.Column("conversation_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("conversations.id"), nullable=False),
+        sa.Column("conversation_id", postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column("role", sa.String(50), nullable=False),
         sa.Column("content", sa.Text, nullable=False),
         sa.Column("tool_calls", postgresql.JSONB, nullable=True),
@@ -143,7 +166,7 @@ def upgrade() -> None:
     op.create_table(
         "alert_configs",
         sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
-        sa.Column("organization_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("organizations.id"), nullable=False),
+        sa.Column("organization_id", postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column("name", sa.String(255), nullable=False),
         sa.Column("trigger_type", sa.String(100), nullable=False),
         sa.Column("trigger_config", postgresql.JSONB, nullable=True),
@@ -156,15 +179,29 @@ def upgrade() -> None:
     op.create_table(
         "alert_events",
         sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
-        sa.Column("alert_config_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("alert_configs.id"), nullable=False),
-        sa.Column("organization_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("organizations.id"), nullable=False),
-        sa.Column("employee_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("employees.id"), nullable=False),
+        sa.Column("alert_config_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("organization_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("employee_id", postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column("status", sa.String(50), nullable=False, server_default="triggered"),
         sa.Column("context", postgresql.JSONB, nullable=True),
         sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
         sa.Column("resolved_at", sa.DateTime(timezone=True), nullable=True),
     )
 
+    # Add foreign keys as NOT VALID (no per-table scan while adding), then
+    # validate them in a separate step. Names match PostgreSQL's defaults.
+    for table, column, referent in _FOREIGN_KEYS:
+        op.create_foreign_key(
+            f"{table}_{column}_fkey",
+            table,
+            referent,
+            [column],
+            ["id"],
+            postgresql_not_valid=True,
+        )
+    for table, column, _ in _FOREIGN_KEYS:
+        op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {table}_{column}_fkey")
+
 
 def downgrade() -> None:
     op.drop_table("alert_events")
@@ -0,0 +1,77 @@
+"""Add composite indexes for alert listing
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-02-20
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "003"
+down_revision: Union[str, None] = "002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        # Serves list_alert_events: WHERE organization_id = ? ORDER BY created_at DESC
+        op.create_index(
+            "ix_alert_events_org_created",
+            "alert_events",
+            ["organization_id", sa.text("created_at DESC")],
+            postgresql_concurrently=True,
+        )
+
+        # Serves the status filter; resolved events are rarely listed
+        op.create_index(
+            "ix_alert_events_org_status_created",
+            "alert_events",
+            ["organization_id", "status", sa.text("created_at DESC")],
+            postgresql_where=sa.text("status <> 'resolved'"),
+            postgresql_concurrently=True,
+        )
+
+        # Serves the config_id filter
+        op.create_index(
+            "ix_alert_events_config_id",
+            "alert_events",
+            ["alert_config_id", sa.text("created_at DESC")],
+            postgresql_concurrently=True,
+        )
+
+        # Serves list_alert_configs
+        op.create_index(
+            "ix_alert_configs_org_created",
+            "alert_configs",
+            ["organization_id", sa.text("created_at DESC")],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_alert_configs_org_created",
+            table_name="alert_configs",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_alert_events_config_id",
+            table_name="alert_events",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_alert_events_org_status_created",
+            table_name="alert_events",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_alert_events_org_created",
+            table_name="alert_events",
+            postgresql_concurrently=True,
+        )
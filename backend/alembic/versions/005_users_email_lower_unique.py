@@ -0,0 +1,32 @@
+"""Make users.email unique case-insensitively
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-02-21
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "005"
+down_revision: Union[str, None] = "004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("UPDATE users SET email = lower(email) WHERE email <> lower(email)")
+    op.drop_constraint("users_email_key", "users", type_="unique")
+    op.create_index(
+        "users_email_lower_idx",
+        "users",
+        [sa.text("lower(email)")],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("users_email_lower_idx", table_name="users")
+    op.create_unique_constraint("users_email_key", "users", ["email"])
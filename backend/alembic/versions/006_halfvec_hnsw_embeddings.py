@@ -0,0 +1,70 @@
+"""Store embeddings as halfvec and index policy chunks with HNSW
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-02-22
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "006"
+down_revision: Union[str, None] = "005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index("ix_policy_chunks_embedding", table_name="policy_chunks")
+
+    # FP16 storage halves the bytes read per vector (halfvec needs pgvector >= 0.7;
+    # the retriever also sets hnsw.iterative_scan, so the app needs >= 0.8)
+    op.execute(
+        "ALTER TABLE policy_chunks ALTER COLUMN embedding "
+        "TYPE halfvec(1536) USING embedding::halfvec(1536)"
+    )
+    op.execute(
+        "ALTER TABLE policy_documents ALTER COLUMN embedding "
+        "TYPE halfvec(1536) USING embedding::halfvec(1536)"
+    )
+
+    # Build the HNSW index outside the migration transaction so it does not
+    # block writes or hold one long transaction open. Session-level SETs give
+    # the build enough memory to keep the graph in RAM.
+    with op.get_context().autocommit_block():
+        op.execute("SET maintenance_work_mem = '2GB'")
+        op.execute("SET max_parallel_maintenance_workers = 7")
+        op.create_index(
+            "ix_policy_chunks_embedding",
+            "policy_chunks",
+            ["embedding"],
+            postgresql_using="hnsw",
+            postgresql_with={"m": 24, "ef_construction": 128},
+            postgresql_ops={"embedding": "halfvec_cosine_ops"},
+            postgresql_concurrently=True,
+        )
+        op.execute("RESET max_parallel_maintenance_workers")
+        op.execute("RESET maintenance_work_mem")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_policy_chunks_embedding", table_name="policy_chunks")
+
+    op.execute(
+        "ALTER TABLE policy_documents ALTER COLUMN embedding "
+        "TYPE vector(1536) USING embedding::vector(1536)"
+    )
+    op.execute(
+        "ALTER TABLE policy_chunks ALTER COLUMN embedding "
+        "TYPE vector(1536) USING embedding::vector(1536)"
+    )
+
+    op.create_index(
+        "ix_policy_chunks_embedding",
+        "policy_chunks",
+        ["embedding"],
+        postgresql_using="ivfflat",
+        postgresql_with={"lists": 100},
+        postgresql_ops={"embedding": "vector_cosine_ops"},
+    )
@@ -0,0 +1,37 @@
+"""Add partial index for active alert configs by trigger type
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-02-23
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "007"
+down_revision: Union[str, None] = "006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Serves process_trigger_event: active configs for (org, trigger_type)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_alert_configs_active_trigger",
+            "alert_configs",
+            ["organization_id", "trigger_type"],
+            postgresql_where=sa.text("is_active = true"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_alert_configs_active_trigger",
+            table_name="alert_configs",
+            postgresql_concurrently=True,
+        )
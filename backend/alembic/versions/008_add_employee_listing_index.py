@@ -0,0 +1,36 @@
+"""Add composite index for employee listing filters
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-02-24
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "008"
+down_revision: Union[str, None] = "007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Serves list_employees and its COUNT: WHERE organization_id = ?
+    # [AND status = ?] [AND department = ?]
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_employees_org_status_department",
+            "employees",
+            ["organization_id", "status", "department"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_employees_org_status_department",
+            table_name="employees",
+            postgresql_concurrently=True,
+        )
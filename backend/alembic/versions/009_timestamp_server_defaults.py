@@ -0,0 +1,44 @@
+"""Stamp row timestamps with server-side defaults
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-14
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "009"
+down_revision: Union[str, None] = "008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column) pairs stamped with the transaction timestamp
+_NOW_COLUMNS = [
+    ("organizations", "created_at"),
+    ("employees", "created_at"),
+    ("users", "created_at"),
+    ("leave_requests", "created_at"),
+    ("documents", "created_at"),
+    ("policy_documents", "updated_at"),
+    ("conversations", "started_at"),
+    ("alert_configs", "created_at"),
+    ("alert_events", "created_at"),
+    ("policy_chunks", "created_at"),
+    ("invites", "created_at"),
+]
+
+
+def upgrade() -> None:
+    for table, column in _NOW_COLUMNS:
+        op.alter_column(table, column, server_default=sa.text("now()"))
+    # Messages written in one transaction must still sort in insert order
+    op.alter_column("messages", "created_at", server_default=sa.text("clock_timestamp()"))
+
+
+def downgrade() -> None:
+    op.alter_column("messages", "created_at", server_default=None)
+    for table, column in reversed(_NOW_COLUMNS):
+        op.alter_column(table, column, server_default=None)
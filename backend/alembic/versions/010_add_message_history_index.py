@@ -0,0 +1,37 @@
+"""Add keyset index for conversation history
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-14
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "010"
+down_revision: Union[str, None] = "009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        # Serves get_conversation_history: WHERE conversation_id = ?
+        # [AND (created_at, id) > (?, ?)] ORDER BY created_at, id
+        op.create_index(
+            "ix_messages_conversation_created_id",
+            "messages",
+            ["conversation_id", "created_at", "id"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_messages_conversation_created_id",
+            table_name="messages",
+            postgresql_concurrently=True,
+        )
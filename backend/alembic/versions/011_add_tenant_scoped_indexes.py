@@ -0,0 +1,108 @@
+"""Add composite indexes for tenant-scoped listings
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-14
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "011"
+down_revision: Union[str, None] = "010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # One balance row per employee, year and leave type; also serves the
+    # employee_id-prefixed balance lookups. Fails if duplicates exist.
+    op.create_unique_constraint(
+        "uq_leave_balances_employee_year_type",
+        "leave_balances",
+        ["employee_id", "year", "leave_type"],
+    )
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        # Serves list_leave_requests for admins: WHERE organization_id = ?
+        # ORDER BY created_at DESC
+        op.create_index(
+            "ix_leave_requests_org_created",
+            "leave_requests",
+            ["organization_id", sa.text("created_at DESC")],
+            postgresql_concurrently=True,
+        )
+
+        # Serves list_leave_requests for one employee
+        op.create_index(
+            "ix_leave_requests_org_employee_created",
+            "leave_requests",
+            ["organization_id", "employee_id", sa.text("created_at DESC")],
+            postgresql_concurrently=True,
+        )
+
+        # Serves list_conversations: WHERE organization_id = ? AND
+        # employee_id = ? ORDER BY started_at DESC
+        op.create_index(
+            "ix_conversations_org_employee_started",
+            "conversations",
+            ["organization_id", "employee_id", sa.text("started_at DESC")],
+            postgresql_concurrently=True,
+        )
+
+        # Serves list_documents: WHERE organization_id = ? ORDER BY created_at DESC
+        op.create_index(
+            "ix_documents_org_created",
+            "documents",
+            ["organization_id", sa.text("created_at DESC")],
+            postgresql_concurrently=True,
+        )
+
+        # Serves list_policies; inactive policies are never listed
+        op.create_index(
+            "ix_policy_documents_org_updated_active",
+            "policy_documents",
+            ["organization_id", sa.text("updated_at DESC")],
+            postgresql_where=sa.text("is_active"),
+            postgresql_concurrently=True,
+        )
+
+        # Serves chunk deletes/lookups scoped to org and policy; supersedes
+        # the org-only index
+        op.create_index(
+            "ix_policy_chunks_org_policy_doc",
+            "policy_chunks",
+            ["organization_id", "policy_document_id"],
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_policy_chunks_org_id",
+            table_name="policy_chunks",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_policy_chunks_org_id",
+            "policy_chunks",
+            ["organization_id"],
+            postgresql_concurrently=True,
+        )
+        for name, table in (
+            ("ix_policy_chunks_org_policy_doc", "policy_chunks"),
+            ("ix_policy_documents_org_updated_active", "policy_documents"),
+            ("ix_documents_org_created", "documents"),
+            ("ix_conversations_org_employee_started", "conversations"),
+            ("ix_leave_requests_org_employee_created", "leave_requests"),
+            ("ix_leave_requests_org_created", "leave_requests"),
+        ):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+
+    op.drop_constraint(
+        "uq_leave_balances_employee_year_type", "leave_balances", type_="unique"
+    )
@@ -0,0 +1,40 @@
+"""Add partial index over live (unresolved) alert events
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-14
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "012"
+down_revision: Union[str, None] = "011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        # Serves list_alert_events?unresolved=true: WHERE organization_id = ?
+        # AND status <> 'resolved' ORDER BY created_at DESC. Resolved events
+        # dominate the table, so the index only holds the live working set.
+        op.create_index(
+            "ix_alert_events_live",
+            "alert_events",
+            ["organization_id", sa.text("created_at DESC")],
+            postgresql_where=sa.text("status <> 'resolved'"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_alert_events_live",
+            table_name="alert_events",
+            postgresql_concurrently=True,
+        )
@@ -6,14 +6,14 @@ CRUD for alert configurations, event listing, and external trigger endpoint.
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import func, select
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from pydantic import TypeAdapter
+from sqlalchemy import func, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.dependencies import get_current_user, get_current_tenant, get_db
 from app.models.alert_config import AlertConfig
 from app.models.alert_event import AlertEvent
-from app.models.employee import Employee
 from app.models.user import User
 from app.schemas.alerts import (
     AlertConfigCreate,
@@ -24,18 +24,45 @@ from app.schemas.alerts import (
     AlertEventResponse,
     TriggerEventRequest,
 )
-from app.services.alerts.alert_engine import process_trigger_event
+from app.services.alerts.alert_engine import (
+    EmployeeNotFoundError,
+    dispatch_alert_events,
+    record_trigger_event,
+)
 from app.services.alerts.triggers import TriggerEvent
 
 router = APIRouter(prefix="/alerts", tags=["alerts"])
 
+# Validate a whole page of ORM rows in one pydantic-core call
+_ALERT_CONFIG_LIST = TypeAdapter(list[AlertConfigResponse])
+_ALERT_EVENT_LIST = TypeAdapter(list[AlertEventResponse])
+
 
-def _require_admin(user: User) -> None:
-    if user.role not in ("admin", "hr_manager"):
+async def _require_admin(current_user: User = Depends(get_current_user)) -> User:
+    """Dependency: the current user, provided they are an admin or HR manager."""
+    if not current_user.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin or HR manager access required",
         )
+    return current_user
+
+
+async def _get_owned(
+    db: AsyncSession, model, obj_id: UUID, org_id: UUID, detail: str
+):
+    """Load a row by id within the tenant, or raise 404.
+
+    All handlers share this one statement shape, so it is compiled once and
+    reused from SQLAlchemy's compiled cache.
+    """
+    result = await db.execute(
+        select(model).where(model.id == obj_id, model.organization_id == org_id)
+    )
+    obj = result.scalar_one_or_none()
+    if obj is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=detail)
+    return obj
 
 
 # ── Alert Config CRUD ────────────────────────────────────────────────────────
@@ -48,12 +75,26 @@ async def list_alert_configs(
     db: AsyncSession = Depends(get_db),
 ):
     """List alert configurations for the current organization."""
-    query = select(AlertConfig).where(AlertConfig.organization_id == org_id)
-    count_q = select(func.count()).select_from(query.subquery())
-    total = (await db.execute(count_q)).scalar() or 0
-
-    result = await db.execute(query.order_by(AlertConfig.created_at.desc()))
-    configs = list(result.scalars().all())
+    # Plain column rows skip ORM hydration; the response model reads them
+    # via from_attributes
+    query = (
+        select(
+            AlertConfig.id,
+            AlertConfig.organization_id,
+            AlertConfig.name,
+            AlertConfig.trigger_type,
+            AlertConfig.trigger_config,
+            AlertConfig.action_template,
+            AlertConfig.is_active,
+            AlertConfig.created_at,
+            func.count().over().label("total"),
+        )
+        .where(AlertConfig.organization_id == org_id)
+        .order_by(AlertConfig.created_at.desc())
+    )
+    rows = (await db.execute(query)).all()
+    total = rows[0].total if rows else 0
+    configs = _ALERT_CONFIG_LIST.validate_python(rows, from_attributes=True)
     return AlertConfigListResponse(items=configs, total=total)
 
 
@@ -64,23 +105,26 @@ async def list_alert_configs(
 )
 async def create_alert_config(
     data: AlertConfigCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(_require_admin),
     org_id: UUID = Depends(get_current_tenant),
     db: AsyncSession = Depends(get_db),
 ):
     """Create a new alert configuration (admin/HR only)."""
-    _require_admin(current_user)
-    config = AlertConfig(
-        organization_id=org_id,
-        name=data.name,
-        trigger_type=data.trigger_type,
-        trigger_config=data.trigger_config,
-        action_template=data.action_template,
-        is_active=data.is_active,
+    # INSERT ... RETURNING loads the new row without a follow-up SELECT
+    result = await db.execute(
+        insert(AlertConfig)
+        .values(
+            organization_id=org_id,
+            name=data.name,
+            trigger_type=data.trigger_type,
+            trigger_config=data.trigger_config,
+            action_template=data.action_template,
+            is_active=data.is_active,
+        )
+        .returning(AlertConfig)
     )
-    db.add(config)
-    await db.flush()
-    await db.refresh(config)
+    config = result.scalar_one()
+    await db.commit()
     return config
 
 
@@ -88,55 +132,49 @@ async def create_alert_config(
 async def update_alert_config(
     config_id: UUID,
     data: AlertConfigUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(_require_admin),
     org_id: UUID = Depends(get_current_tenant),
     db: AsyncSession = Depends(get_db),
 ):
     """Update an alert configuration (admin/HR only)."""
-    _require_admin(current_user)
+    update_data = data.model_dump(exclude_unset=True)
+    if not update_data:
+        return await _get_owned(
+            db, AlertConfig, config_id, org_id, "Alert config not found"
+        )
+
+    # UPDATE ... RETURNING applies the change and loads the row at once
     result = await db.execute(
-        select(AlertConfig).where(
+        update(AlertConfig)
+        .where(
             AlertConfig.id == config_id,
             AlertConfig.organization_id == org_id,
         )
+        .values(**update_data)
+        .returning(AlertConfig)
     )
     config = result.scalar_one_or_none()
     if not config:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Alert config not found"
         )
-
-    update_data = data.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(config, field, value)
-
-    await db.flush()
-    await db.refresh(config)
+    await db.commit()
     return config
 
 
 @router.delete("/configs/{config_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def deactivate_alert_config(
     config_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(_require_admin),
     org_id: UUID = Depends(get_current_tenant),
     db: AsyncSession = Depends(get_db),
 ):
     """Deactivate (soft-delete) an alert configuration (admin/HR only)."""
-    _require_admin(current_user)
-    result = await db.execute(
-        select(AlertConfig).where(
-            AlertConfig.id == config_id,
-            AlertConfig.organization_id == org_id,
-        )
+    config = await _get_owned(
+        db, AlertConfig, config_id, org_id, "Alert config not found"
     )
-    config = result.scalar_one_or_none()
-    if not config:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Alert config not found"
-        )
     config.is_active = False
-    await db.flush()
+    await db.commit()
     return None
 
 
@@ -147,35 +185,61 @@ async def deactivate_alert_config(
 async def list_alert_events(
     status_filter: Optional[str] = Query(None, alias="status"),
     config_id: Optional[UUID] = None,
+    unresolved: bool = False,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     current_user: User = Depends(get_current_user),
     org_id: UUID = Depends(get_current_tenant),
     db: AsyncSession = Depends(get_db),
 ):
-    """List alert events for the current organization (with optional filters)."""
-    query = select(AlertEvent).where(AlertEvent.organization_id == org_id)
+    """List alert events for the current organization (with optional filters).
+
+    ``unresolved=true`` keeps only live events (anything not resolved).
+    """
+    query = select(AlertEvent, func.count().over().label("total")).where(
+        AlertEvent.organization_id == org_id
+    )
     if status_filter:
         query = query.where(AlertEvent.status == status_filter)
+    if unresolved:
+        # Matches the ix_alert_events_live partial index predicate
+        query = query.where(AlertEvent.status != "resolved")
     if config_id:
         query = query.where(AlertEvent.alert_config_id == config_id)
 
-    count_q = select(func.count()).select_from(query.subquery())
-    total = (await db.execute(count_q)).scalar() or 0
-
+    # count(*) OVER () returns the total alongside the page in one round trip
     query = query.order_by(AlertEvent.created_at.desc())
     query = query.offset((page - 1) * page_size).limit(page_size)
-    result = await db.execute(query)
-    events = list(result.scalars().all())
+    rows = (await db.execute(query)).all()
+    total = rows[0].total if rows else 0
+    events = _ALERT_EVENT_LIST.validate_python(
+        [row[0] for row in rows], from_attributes=True
+    )
     return AlertEventListResponse(items=events, total=total)
 
 
+@router.get("/events/{event_id}", response_model=AlertEventResponse)
+async def get_alert_event(
+    event_id: UUID,
+    current_user: User = Depends(get_current_user),
+    org_id: UUID = Depends(get_current_tenant),
+    db: AsyncSession = Depends(get_db),
+):
+    """Get a single alert event (e.g. to poll a queued trigger)."""
+    return await _get_owned(db, AlertEvent, event_id, org_id, "Alert event not found")
+
+
 # ── External Trigger Endpoint ────────────────────────────────────────────────
 
 
-@router.post("/trigger", response_model=AlertEventResponse)
+@router.post(
+    "/trigger",
+    response_model=AlertEventResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
 async def trigger_alert(
     data: TriggerEventRequest,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     org_id: UUID = Depends(get_current_tenant),
     db: AsyncSession = Depends(get_db),
@@ -184,20 +248,11 @@ async def trigger_alert(
 
     For example, an attendance system can POST here when an employee is absent.
     Requires JWT authentication.
-    """
-    # Verify the employee belongs to this org
-    emp_result = await db.execute(
-        select(Employee).where(
-            Employee.id == data.employee_id,
-            Employee.organization_id == org_id,
-        )
-    )
-    if not emp_result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Employee not found in this organization",
-        )
 
+    The alert event is recorded and returned immediately with status
+    ``triggered``; the proactive message is sent in the background, after
+    which the event moves to ``in_progress`` (poll ``GET /events/{id}``).
+    """
     trigger_event = TriggerEvent(
         trigger_type=data.trigger_type,
         employee_id=data.employee_id,
@@ -205,12 +260,23 @@ async def trigger_alert(
         context=data.context,
     )
 
-    alert_event = await process_trigger_event(db, trigger_event)
-    if not alert_event:
+    # record_trigger_event verifies the employee belongs to this org
+    try:
+        alert_events = await record_trigger_event(db, trigger_event)
+    except EmployeeNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Employee not found in this organization",
+        )
+    if not alert_events:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail=f"No active alert config found for trigger_type='{data.trigger_type}'",
         )
 
-    return alert_event
-
+    # Commit before the background task reads the events in its own session
+    await db.commit()
+    background_tasks.add_task(
+        dispatch_alert_events, [event.id for event in alert_events]
+    )
+    return alert_events[-1]
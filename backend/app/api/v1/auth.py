@@ -1,11 +1,14 @@
 """Authentication endpoints: register-org, login, invite-user, join, me."""
 
+import asyncio
 import re
 import secrets
 import uuid
+from datetime import UTC, datetime, timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.v1.schemas import (
@@ -17,6 +20,7 @@ from app.api.v1.schemas import (
     TokenResponse,
     UserResponse,
 )
+from app.core.config import settings
 from app.core.dependencies import get_current_user, get_db
 from app.core.security import (
     create_access_token,
@@ -25,21 +29,36 @@ from app.core.security import (
     verify_password,
 )
 from app.models.employee import Employee
+from app.models.invite import Invite
 from app.models.organization import Organization
 from app.models.user import User
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
-# In-memory invite store (keyed by invite_code)
-# In production this would be a DB table or Redis
-_pending_invites: dict[str, dict] = {}
-
 
 def _slugify(name: str) -> str:
     slug = re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
     return slug or "org"
 
 
+async def _insert_user(db: AsyncSession, **values) -> uuid.UUID:
+    """Insert a user and return its id; 409 if the email is already taken.
+
+    ON CONFLICT on the lower(email) unique index makes the check atomic, so
+    concurrent signups with the same email cannot both succeed.
+    """
+    result = await db.execute(
+        pg_insert(User)
+        .values(**values)
+        .on_conflict_do_nothing(index_elements=[func.lower(User.email)])
+        .returning(User.id)
+    )
+    user_id = result.scalar_one_or_none()
+    if user_id is None:
+        raise HTTPException(status_code=409, detail="Email already registered")
+    return user_id
+
+
 # ── POST /register-org ────────────────────────────────────────────────────────
 
 
@@ -47,45 +66,47 @@ def _slugify(name: str) -> str:
 async def register_org(body: RegisterOrgRequest, db: AsyncSession = Depends(get_db)):
     """Create a new organization and its admin user. Returns a JWT."""
 
-    # Check if email already taken
-    existing = await db.execute(select(User).where(User.email == body.admin_email))
-    if existing.scalar_one_or_none():
-        raise HTTPException(status_code=409, detail="Email already registered")
+    admin_email = body.admin_email.lower()
+
+    # Assign primary keys client-side so the org and employee rows can be
+    # inserted in a single flush
+    org_id = uuid.uuid4()
+    employee_id = uuid.uuid4()
 
     # Create org
     base_slug = _slugify(body.org_name)
     slug = f"{base_slug}-{uuid.uuid4().hex[:6]}"
-    org = Organization(name=body.org_name, slug=slug)
-    db.add(org)
-    await db.flush()  # get org.id
+    org = Organization(id=org_id, name=body.org_name, slug=slug)
 
     # Create corresponding employee record so chat works
     employee = Employee(
-        organization_id=org.id,
+        id=employee_id,
+        organization_id=org_id,
         employee_code=f"ADMIN-{uuid.uuid4().hex[:6].upper()}",
         full_name=body.admin_name,
-        email=body.admin_email,
+        email=admin_email,
         department="Management",
         position="Administrator",
         status="active",
     )
-    db.add(employee)
+
+    db.add_all([org, employee])
     await db.flush()
 
-    # Create admin user
-    user = User(
-        organization_id=org.id,
-        email=body.admin_email,
-        hashed_password=hash_password(body.password),
+    # Create admin user (rolls the org back if the email is taken)
+    user_id = await _insert_user(
+        db,
+        organization_id=org_id,
+        email=admin_email,
+        hashed_password=await asyncio.to_thread(hash_password, body.password),
         role="admin",
         full_name=body.admin_name,
-        employee_id=employee.id,
+        employee_id=employee_id,
     )
-    db.add(user)
-    await db.flush()
+    await db.commit()
 
     token = create_access_token(
-        {"sub": str(user.id), "org_id": str(org.id), "role": user.role}
+        {"sub": str(user_id), "org_id": str(org_id), "role": "admin"}
     )
     return TokenResponse(access_token=token)
 
@@ -95,10 +116,15 @@ async def register_org(body: RegisterOrgRequest, db: AsyncSession = Depends(get_
 
 @router.post("/login", response_model=TokenResponse)
 async def login(body: LoginRequest, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(User).where(User.email == body.email))
+    result = await db.execute(
+        select(User).where(func.lower(User.email) == body.email.lower())
+    )
     user = result.scalar_one_or_none()
 
-    if not user or not verify_password(body.password, user.hashed_password):
+    # Password hashing is CPU-bound; keep it off the event loop
+    if not user or not await asyncio.to_thread(
+        verify_password, body.password, user.hashed_password
+    ):
         raise HTTPException(status_code=401, detail="Invalid email or password")
 
     if not user.is_active:
@@ -117,14 +143,22 @@ async def login(body: LoginRequest, db: AsyncSession = Depends(get_db)):
 async def invite_user(
     body: InviteUserRequest,
     current_user=Depends(require_role("admin", "hr_manager")),
+    db: AsyncSession = Depends(get_db),
 ):
+    # Invites live in the database so every worker can redeem them
     invite_code = secrets.token_urlsafe(16)
-    _pending_invites[invite_code] = {
-        "org_id": str(current_user.organization_id),
-        "email": body.email,
-        "role": body.role,
-        "full_name": body.full_name,
-    }
+    db.add(
+        Invite(
+            code=invite_code,
+            organization_id=current_user.organization_id,
+            email=body.email.lower(),
+            role=body.role,
+            full_name=body.full_name,
+            expires_at=datetime.now(UTC)
+            + timedelta(hours=settings.INVITE_EXPIRE_HOURS),
+        )
+    )
+    await db.commit()
     return InviteResponse(
         invite_code=invite_code,
         email=body.email,
@@ -138,41 +172,54 @@ async def invite_user(
 @router.post("/join", response_model=TokenResponse, status_code=201)
 async def join_org(body: JoinOrgRequest, db: AsyncSession = Depends(get_db)):
     """User joins an organization using an invite code."""
-    invite = _pending_invites.pop(body.invite_code, None)
+    # Consume the invite atomically; a concurrent join with the same code gets nothing
+    result = await db.execute(
+        delete(Invite)
+        .where(
+            Invite.code == body.invite_code,
+            Invite.expires_at > datetime.now(UTC),
+        )
+        .returning(
+            Invite.organization_id, Invite.email, Invite.role, Invite.full_name
+        )
+    )
+    invite = result.one_or_none()
     if not invite:
         raise HTTPException(status_code=404, detail="Invalid or expired invite code")
 
-    # Check email not already registered
-    existing = await db.execute(select(User).where(User.email == invite["email"]))
-    if existing.scalar_one_or_none():
-        raise HTTPException(status_code=409, detail="Email already registered")
-
     # Create corresponding employee record so chat works
+    employee_id = uuid.uuid4()
     employee = Employee(
-        organization_id=uuid.UUID(invite["org_id"]),
+        id=employee_id,
+        organization_id=invite.organization_id,
         employee_code=f"EMP-{uuid.uuid4().hex[:6].upper()}",
-        full_name=invite["full_name"],
-        email=invite["email"],
+        full_name=invite.full_name,
+        email=invite.email,
         department=None,
         position=None,
         status="active",
     )
+
     db.add(employee)
     await db.flush()
 
-    user = User(
-        organization_id=uuid.UUID(invite["org_id"]),
-        email=invite["email"],
-        hashed_password=hash_password(body.password),
-        role=invite["role"],
-        full_name=invite["full_name"],
-        employee_id=employee.id,
+    user_id = await _insert_user(
+        db,
+        organization_id=invite.organization_id,
+        email=invite.email,
+        hashed_password=await asyncio.to_thread(hash_password, body.password),
+        role=invite.role,
+        full_name=invite.full_name,
+        employee_id=employee_id,
     )
-    db.add(user)
-    await db.flush()
+    await db.commit()
 
     token = create_access_token(
-        {"sub": str(user.id), "org_id": invite["org_id"], "role": user.role}
+        {
+            "sub": str(user_id),
+            "org_id": str(invite.organization_id),
+            "role": invite.role,
+        }
     )
     return TokenResponse(access_token=token)
 
@@ -1,19 +1,28 @@
 """Chat API endpoints — REST and WebSocket for the AI HR agent."""
 
-import json
+import asyncio
 import logging
+from collections import defaultdict
 from datetime import datetime
-from typing import Optional
+from typing import Any, AsyncIterator, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect, status
-from pydantic import BaseModel
+import orjson
+from cachetools import TTLCache
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, TypeAdapter, ValidationError
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.core.database import async_session_factory
-from app.core.dependencies import get_current_user, get_current_tenant, get_db
+from app.core.dependencies import (
+    get_current_tenant,
+    get_current_user,
+    get_db,
+    get_org_generation,
+)
 from app.core.security import decode_access_token
 from app.models.organization import Organization
 from app.models.user import User
@@ -29,13 +38,13 @@ router = APIRouter(prefix="/chat", tags=["chat"])
 
 
 class SendMessageRequest(BaseModel):
-    conversation_id: str
+    conversation_id: UUID
     content: str
 
 
 class MessageResponse(BaseModel):
-    id: Optional[str] = None
-    conversation_id: str
+    id: Optional[UUID] = None
+    conversation_id: UUID
     role: str
     content: str
     tool_calls: Optional[list] = None
@@ -45,20 +54,33 @@ class MessageResponse(BaseModel):
 
 
 class ConversationResponse(BaseModel):
-    id: str
-    employee_id: str
+    id: UUID
+    employee_id: UUID
     channel: str
     status: str
     started_at: Optional[datetime] = None
     ended_at: Optional[datetime] = None
-    messages: Optional[list[MessageResponse]] = None
 
     model_config = {"from_attributes": True}
 
 
+class ConversationDetailResponse(ConversationResponse):
+    messages: list[MessageResponse] = []
+
+
 class ConversationListResponse(BaseModel):
     items: list[ConversationResponse]
     total: int
+    page: int
+    page_size: int
+
+
+# Builds list_conversations pages; message lists are not part of the page
+_CONVERSATION_LIST = TypeAdapter(list[ConversationResponse])
+
+
+class StreamMessageRequest(BaseModel):
+    content: str
 
 
 class ChatResponse(BaseModel):
@@ -74,6 +96,26 @@ from app.services.agent.conversation_manager import ConversationManager
 
 _conversation_manager = ConversationManager()
 
+# WebSocket auth results keyed by user id: (org_id, employee_id, org
+# generation). Same TTL and generation check as get_current_user, so a
+# deactivated user or changed org is seen as quickly; the token is still
+# decoded (and expiry checked) on every connect.
+_ws_auth_cache: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+
+# Connection caps: a hard ceiling on memory held by open sockets
+_ws_slots = asyncio.Semaphore(settings.WS_MAX_CONNECTIONS)
+_ws_per_user: defaultdict[UUID, int] = defaultdict(int)
+
+# Compiled once; validates conversation ids arriving over the websocket
+_UUID_ADAPTER = TypeAdapter(UUID)
+
+# "Try again later" close code
+_WS_CLOSE_TRY_AGAIN = 1013
+
+# Stream events produced within this window (or up to this size) share a frame
+_WS_FLUSH_INTERVAL = 0.02
+_WS_FLUSH_BYTES = 8192
+
 
 def _get_employee_id(user: User) -> UUID:
     if not user.employee_id:
@@ -90,21 +132,76 @@ async def _get_org(db: AsyncSession, org_id: UUID) -> Organization | None:
     return result.scalar_one_or_none()
 
 
-async def _get_org_name(db: AsyncSession, org_id: UUID) -> str:
-    org = await _get_org(db, org_id)
-    return org.name if org else "Your Organization"
+async def _ws_send(websocket: WebSocket, data: dict) -> None:
+    """Send one JSON event, encoded with orjson, as a text frame."""
+    await websocket.send_text(orjson.dumps(data).decode())
 
 
-async def _create_agent(db: AsyncSession, org_id: UUID) -> HRAgent:
-    """Create an HRAgent per-request using the org's AI config."""
-    org = await _get_org(db, org_id)
+async def _ws_receive(websocket: WebSocket) -> Any:
+    """Receive one JSON message (text or binary frame), decoded with orjson."""
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000))
+    return orjson.loads(message.get("text") or message.get("bytes") or b"")
+
+
+async def _send_batched(websocket: WebSocket, events: AsyncIterator[str]) -> None:
+    """Forward stream events, coalescing bursts into newline-delimited frames.
+
+    Token events arrive in rapid bursts; sending each as its own frame pays
+    frame, TLS record and TCP overhead per token.
+    """
+    queue: asyncio.Queue[str | None] = asyncio.Queue()
+
+    async def produce() -> None:
+        try:
+            async for event in events:
+                await queue.put(event)
+        finally:
+            await queue.put(None)
+
+    producer = asyncio.create_task(produce())
+    loop = asyncio.get_running_loop()
+    try:
+        finished = False
+        while not finished:
+            event = await queue.get()
+            if event is None:
+                break
+            batch = [event]
+            size = len(event)
+            deadline = loop.time() + _WS_FLUSH_INTERVAL
+            while size < _WS_FLUSH_BYTES:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if event is None:
+                    finished = True
+                    break
+                batch.append(event)
+                size += len(event)
+            await websocket.send_text("\n".join(batch))
+        # Re-raise any error from the stream itself
+        await producer
+    finally:
+        # Wait for the stream to unwind; the caller closes its DB session next
+        producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
+
+
+def _create_agent(org: Organization | None) -> tuple[HRAgent, str]:
+    """Create an HRAgent from the org's AI config; also returns the org name."""
     if org and org.settings:
         raw_config = org.settings.get("ai_config", {})
     else:
         raw_config = {}
 
     ai_config = _normalize_ai_config(raw_config) if raw_config else get_default_ai_config()
-    return HRAgent(ai_config=ai_config)
+    return HRAgent(ai_config=ai_config), org.name if org else "Your Organization"
 
 
 # ── REST Endpoints ────────────────────────────────────────────────────────────
@@ -121,39 +218,32 @@ async def create_conversation(
     conv = await _conversation_manager.create_conversation(
         db, org_id, emp_id, channel="web"
     )
-    return ConversationResponse(
-        id=str(conv.id),
-        employee_id=str(conv.employee_id),
-        channel=conv.channel,
-        status=conv.status,
-        started_at=conv.started_at,
-    )
+    await db.commit()
+    return ConversationResponse.model_validate(conv)
 
 
 @router.get("/conversations", response_model=ConversationListResponse)
 async def list_conversations(
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
     current_user: User = Depends(get_current_user),
     org_id: UUID = Depends(get_current_tenant),
     db: AsyncSession = Depends(get_db),
 ):
-    """List the current user's conversations."""
+    """List the current user's conversations (paginated)."""
     emp_id = _get_employee_id(current_user)
-    convs = await _conversation_manager.list_conversations(db, org_id, emp_id)
-    items = [
-        ConversationResponse(
-            id=str(c.id),
-            employee_id=str(c.employee_id),
-            channel=c.channel,
-            status=c.status,
-            started_at=c.started_at,
-            ended_at=c.ended_at,
-        )
-        for c in convs
-    ]
-    return ConversationListResponse(items=items, total=len(items))
+    convs, total = await _conversation_manager.list_conversations(
+        db, org_id, emp_id, page=page, page_size=page_size
+    )
+    return ConversationListResponse(
+        items=_CONVERSATION_LIST.validate_python(convs, from_attributes=True),
+        total=total,
+        page=page,
+        page_size=page_size,
+    )
 
 
-@router.get("/conversations/{conversation_id}", response_model=ConversationResponse)
+@router.get("/conversations/{conversation_id}", response_model=ConversationDetailResponse)
 async def get_conversation(
     conversation_id: UUID,
     current_user: User = Depends(get_current_user),
@@ -161,35 +251,18 @@ async def get_conversation(
     db: AsyncSession = Depends(get_db),
 ):
     """Get a conversation with all its messages."""
-    conv = await _conversation_manager.get_conversation(db, conversation_id, org_id)
+    conv = await _conversation_manager.get_conversation(
+        db, conversation_id, org_id, load_messages=True
+    )
     if conv is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Conversation not found")
 
     # Verify the conversation belongs to this employee
     emp_id = _get_employee_id(current_user)
-    if conv.employee_id != emp_id and current_user.role not in ("admin", "hr_manager"):
+    if conv.employee_id != emp_id and not current_user.is_admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
 
-    messages = [
-        MessageResponse(
-            id=str(m.id),
-            conversation_id=str(m.conversation_id),
-            role=m.role,
-            content=m.content,
-            tool_calls=m.tool_calls,
-            created_at=m.created_at,
-        )
-        for m in (conv.messages or [])
-    ]
-    return ConversationResponse(
-        id=str(conv.id),
-        employee_id=str(conv.employee_id),
-        channel=conv.channel,
-        status=conv.status,
-        started_at=conv.started_at,
-        ended_at=conv.ended_at,
-        messages=messages,
-    )
+    return ConversationDetailResponse.model_validate(conv)
 
 
 @router.post("/message", response_model=ChatResponse)
@@ -201,10 +274,12 @@ async def send_message(
 ):
     """Send a message and get an AI response."""
     emp_id = _get_employee_id(current_user)
-    conversation_id = UUID(data.conversation_id)
+    conversation_id = data.conversation_id
 
     # Verify conversation exists and belongs to user
-    conv = await _conversation_manager.get_conversation(db, conversation_id, org_id)
+    conv = await _conversation_manager.get_conversation_header(
+        db, conversation_id, org_id
+    )
     if conv is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Conversation not found")
     if conv.employee_id != emp_id:
@@ -212,9 +287,9 @@ async def send_message(
     if conv.status != "active":
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Conversation is closed")
 
-    # Create agent per-request with org's AI config
-    agent = await _create_agent(db, org_id)
-    org_name = await _get_org_name(db, org_id)
+    # Create agent per-request with org's AI config; the org was loaded
+    # alongside the user
+    agent, org_name = _create_agent(current_user.organization)
     result = await agent.chat(
         db=db,
         conversation_id=conversation_id,
@@ -223,9 +298,64 @@ async def send_message(
         organization_id=org_id,
         org_name=org_name,
     )
+    await db.commit()
     return ChatResponse(**result)
 
 
+@router.post("/conversations/{conversation_id}/stream")
+async def stream_message(
+    conversation_id: UUID,
+    data: StreamMessageRequest,
+    current_user: User = Depends(get_current_user),
+    org_id: UUID = Depends(get_current_tenant),
+    db: AsyncSession = Depends(get_db),
+):
+    """Send a message and stream the AI response as Server-Sent Events.
+
+    Carries the same events as the WebSocket stream, one per ``data:`` line,
+    for clients that only need request → streamed answer.
+    """
+    emp_id = _get_employee_id(current_user)
+    conv = await _conversation_manager.get_conversation_header(
+        db, conversation_id, org_id
+    )
+    if conv is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Conversation not found")
+    if conv.employee_id != emp_id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
+    if conv.status != "active":
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Conversation is closed")
+
+    agent, org_name = _create_agent(current_user.organization)
+
+    async def event_stream() -> AsyncIterator[str]:
+        # Request-scoped dependencies are torn down before the body streams,
+        # so the stream uses its own session
+        async with async_session_factory() as stream_db:
+            try:
+                async for event in agent.chat_stream(
+                    db=stream_db,
+                    conversation_id=conversation_id,
+                    user_message=data.content,
+                    employee_id=emp_id,
+                    organization_id=org_id,
+                    org_name=org_name,
+                ):
+                    yield f"data: {event}\n\n"
+                await stream_db.commit()
+            except Exception as e:
+                logger.exception("SSE chat error")
+                await stream_db.rollback()
+                error = orjson.dumps({"type": "error", "message": str(e)}).decode()
+                yield f"data: {error}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 # ── WebSocket Endpoint ────────────────────────────────────────────────────────
 
 
@@ -236,19 +366,25 @@ async def websocket_chat(websocket: WebSocket):
     Protocol:
     1. Client connects and sends an auth message: {"type": "auth", "token": "<jwt>"}
     2. Client sends chat messages: {"type": "message", "conversation_id": "<id>", "content": "..."}
-    3. Server streams back events (see HRAgent.chat_stream for event types)
+    3. Server streams back events (see HRAgent.chat_stream for event types).
+       Stream frames may carry several JSON events separated by newlines.
     """
     await websocket.accept()
 
-    user = None
+    if _ws_slots.locked():
+        await websocket.close(code=_WS_CLOSE_TRY_AGAIN)
+        return
+    await _ws_slots.acquire()
+
     org_id = None
     employee_id = None
+    user_key: UUID | None = None
 
     try:
         # Wait for auth message
-        auth_data = await websocket.receive_json()
+        auth_data = await _ws_receive(websocket)
         if auth_data.get("type") != "auth" or not auth_data.get("token"):
-            await websocket.send_json({"type": "error", "message": "First message must be auth"})
+            await _ws_send(websocket, {"type": "error", "message": "First message must be auth"})
             await websocket.close(code=4001)
             return
 
@@ -256,75 +392,99 @@ async def websocket_chat(websocket: WebSocket):
         try:
             payload = decode_access_token(auth_data["token"])
         except ValueError:
-            await websocket.send_json({"type": "error", "message": "Invalid token"})
+            await _ws_send(websocket, {"type": "error", "message": "Invalid token"})
             await websocket.close(code=4001)
             return
 
         user_id = payload.get("sub")
         if not user_id:
-            await websocket.send_json({"type": "error", "message": "Invalid token payload"})
+            await _ws_send(websocket, {"type": "error", "message": "Invalid token payload"})
             await websocket.close(code=4001)
             return
 
-        # Get user from DB
-        async with async_session_factory() as db:
-            result = await db.execute(
-                select(User).where(User.id == UUID(user_id))
-            )
-            user = result.scalar_one_or_none()
-            if not user or not user.is_active:
-                await websocket.send_json({"type": "error", "message": "User not found"})
-                await websocket.close(code=4001)
-                return
-
-            org_id = user.organization_id
-            employee_id = user.employee_id
-            if not employee_id:
-                await websocket.send_json({"type": "error", "message": "No employee profile"})
-                await websocket.close(code=4001)
-                return
-
-            org_name = await _get_org_name(db, org_id)
+        # Resolve the user (cached per user); the session is closed again
+        # before the connection starts waiting for messages
+        user_uuid = UUID(user_id)
+        cached = _ws_auth_cache.get(user_uuid)
+        if cached is not None and cached[2] == get_org_generation(cached[0]):
+            org_id, employee_id, _ = cached
+        else:
+            async with async_session_factory() as db:
+                result = await db.execute(
+                    select(
+                        User.organization_id, User.employee_id, User.is_active
+                    ).where(User.id == user_uuid)
+                )
+                user = result.one_or_none()
+                if not user or not user.is_active:
+                    await _ws_send(websocket, {"type": "error", "message": "User not found"})
+                    await websocket.close(code=4001)
+                    return
+
+                org_id = user.organization_id
+                employee_id = user.employee_id
+                if not employee_id:
+                    await _ws_send(websocket, {"type": "error", "message": "No employee profile"})
+                    await websocket.close(code=4001)
+                    return
+                generation = get_org_generation(org_id)
+            _ws_auth_cache[user_uuid] = (org_id, employee_id, generation)
+
+        # No await between the check and the increment, so this is race-free
+        if _ws_per_user[user_uuid] >= settings.WS_MAX_CONNECTIONS_PER_USER:
+            await _ws_send(websocket, {"type": "error", "message": "Too many connections"})
+            await websocket.close(code=_WS_CLOSE_TRY_AGAIN)
+            return
+        user_key = user_uuid
+        _ws_per_user[user_key] += 1
 
-        await websocket.send_json({"type": "auth_ok"})
+        await _ws_send(websocket, {"type": "auth_ok"})
 
         # Message loop
         while True:
-            data = await websocket.receive_json()
+            data = await _ws_receive(websocket)
             if data.get("type") != "message":
-                await websocket.send_json({"type": "error", "message": "Expected type: message"})
+                await _ws_send(websocket, {"type": "error", "message": "Expected type: message"})
                 continue
 
             conversation_id = data.get("conversation_id")
             content = data.get("content", "").strip()
             if not conversation_id or not content:
-                await websocket.send_json({"type": "error", "message": "conversation_id and content required"})
+                await _ws_send(websocket, {"type": "error", "message": "conversation_id and content required"})
+                continue
+            try:
+                conv_uuid = _UUID_ADAPTER.validate_python(conversation_id)
+            except ValidationError:
+                await _ws_send(websocket, {"type": "error", "message": "Invalid conversation_id"})
                 continue
 
             async with async_session_factory() as db:
                 try:
-                    conv_uuid = UUID(conversation_id)
-                    conv = await _conversation_manager.get_conversation(db, conv_uuid, org_id)
+                    conv = await _conversation_manager.get_conversation_header(
+                        db, conv_uuid, org_id
+                    )
                     if not conv or conv.employee_id != employee_id:
-                        await websocket.send_json({"type": "error", "message": "Conversation not found"})
+                        await _ws_send(websocket, {"type": "error", "message": "Conversation not found"})
                         continue
 
                     # Create agent per-request with org's AI config
-                    agent = await _create_agent(db, org_id)
-                    async for event in agent.chat_stream(
-                        db=db,
-                        conversation_id=conv_uuid,
-                        user_message=content,
-                        employee_id=employee_id,
-                        organization_id=org_id,
-                        org_name=org_name,
-                    ):
-                        await websocket.send_text(event)
+                    agent, org_name = _create_agent(await _get_org(db, org_id))
+                    await _send_batched(
+                        websocket,
+                        agent.chat_stream(
+                            db=db,
+                            conversation_id=conv_uuid,
+                            user_message=content,
+                            employee_id=employee_id,
+                            organization_id=org_id,
+                            org_name=org_name,
+                        ),
+                    )
 
                     await db.commit()
                 except Exception as e:
                     logger.exception("WebSocket chat error")
-                    await websocket.send_json({"type": "error", "message": str(e)})
+                    await _ws_send(websocket, {"type": "error", "message": str(e)})
 
     except WebSocketDisconnect:
         logger.info("WebSocket client disconnected")
@@ -334,3 +494,9 @@ async def websocket_chat(websocket: WebSocket):
             await websocket.close(code=1011)
         except Exception:
             pass
+    finally:
+        _ws_slots.release()
+        if user_key is not None:
+            _ws_per_user[user_key] -= 1
+            if not _ws_per_user[user_key]:
+                del _ws_per_user[user_key]
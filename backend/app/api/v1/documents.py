@@ -1,9 +1,10 @@
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import func, lambda_stmt, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.lambdas import StatementLambdaElement
 
 from app.core.dependencies import get_current_user, get_current_tenant, get_db
 from app.models.document import Document
@@ -18,28 +19,51 @@ from app.schemas.documents import (
 router = APIRouter(prefix="/documents", tags=["documents"])
 
 
+def _with_document_filters(
+    stmt: StatementLambdaElement, org_id: UUID, user: User
+) -> StatementLambdaElement:
+    """Add the list_documents visibility predicates as cached lambda criteria."""
+    stmt += lambda s: s.where(Document.organization_id == org_id)
+
+    # Non-admin users only see their own documents
+    if not user.is_admin:
+        employee_id = user.employee_id
+        if employee_id:
+            stmt += lambda s: s.where(
+                (Document.employee_id == employee_id)
+                | (Document.employee_id.is_(None))
+            )
+        else:
+            stmt += lambda s: s.where(Document.employee_id.is_(None))
+    return stmt
+
+
 @router.get("", response_model=DocumentListResponse)
 async def list_documents(
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=200),
     current_user: User = Depends(get_current_user),
     org_id: UUID = Depends(get_current_tenant),
     db: AsyncSession = Depends(get_db),
 ):
-    """List documents for the current user."""
-    query = select(Document).where(Document.organization_id == org_id)
-
-    # Non-admin users only see their own documents
-    if current_user.role not in ("admin", "hr_manager"):
-        if current_user.employee_id:
-            query = query.where(
-                (Document.employee_id == current_user.employee_id)
-                | (Document.employee_id.is_(None))
-            )
-        else:
-            query = query.where(Document.employee_id.is_(None))
+    """List documents for the current user (paginated)."""
+    count_q = _with_document_filters(
+        lambda_stmt(lambda: select(func.count()).select_from(Document)), org_id, current_user
+    )
+    total = (await db.execute(count_q)).scalar() or 0
 
+    offset = (page - 1) * page_size
+    query = _with_document_filters(
+        lambda_stmt(lambda: select(Document)), org_id, current_user
+    )
+    query += lambda s: (
+        s.order_by(Document.created_at.desc()).offset(offset).limit(page_size)
+    )
     result = await db.execute(query)
     documents = result.scalars().all()
-    return DocumentListResponse(items=documents, total=len(documents))
+    return DocumentListResponse(
+        items=documents, total=total, page=page, page_size=page_size
+    )
 
 
 @router.get("/{document_id}/download", response_model=DocumentDownloadResponse)
@@ -62,7 +86,7 @@ async def download_document(
         )
 
     # Non-admin users can only download their own documents or org-wide ones
-    if current_user.role not in ("admin", "hr_manager"):
+    if not current_user.is_admin:
         if document.employee_id and document.employee_id != current_user.employee_id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -110,7 +134,6 @@ async def generate_document(
         generated_from_template=True,
     )
     db.add(document)
-    await db.flush()
-    await db.refresh(document)
+    await db.commit()
     return document
 
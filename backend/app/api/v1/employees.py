@@ -2,8 +2,10 @@ from typing import Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import func, select
+from pydantic import TypeAdapter
+from sqlalchemy import func, insert, lambda_stmt, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.lambdas import StatementLambdaElement
 
 from app.core.dependencies import get_current_user, get_current_tenant, get_db
 from app.models.employee import Employee
@@ -14,18 +16,37 @@ from app.schemas.employees import (
     EmployeeResponse,
     EmployeeUpdate,
 )
+from app.services.agent.response_cache import invalidate_employee_replies
 
 router = APIRouter(prefix="/employees", tags=["employees"])
 
+# Page validator for list_employees, built once at import
+_EMPLOYEE_LIST = TypeAdapter(list[EmployeeResponse])
+
 
 def _require_admin(user: User) -> None:
-    if user.role not in ("admin", "hr_manager"):
+    if not user.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin or HR manager access required",
         )
 
 
+def _with_employee_filters(
+    stmt: StatementLambdaElement,
+    org_id: UUID,
+    department: Optional[str],
+    status_filter: Optional[str],
+) -> StatementLambdaElement:
+    """Add the list_employees predicates as cached lambda criteria."""
+    stmt += lambda s: s.where(Employee.organization_id == org_id)
+    if department:
+        stmt += lambda s: s.where(Employee.department == department)
+    if status_filter:
+        stmt += lambda s: s.where(Employee.status == status_filter)
+    return stmt
+
+
 @router.get("/me", response_model=EmployeeResponse)
 async def get_my_employee_record(
     current_user: User = Depends(get_current_user),
@@ -60,18 +81,24 @@ async def list_employees(
     db: AsyncSession = Depends(get_db),
 ):
     """List employees for the current organization (paginated)."""
-    query = select(Employee).where(Employee.organization_id == org_id)
-    if department:
-        query = query.where(Employee.department == department)
-    if status_filter:
-        query = query.where(Employee.status == status_filter)
-
-    count_q = select(func.count()).select_from(query.subquery())
+    # Plain COUNT over the same predicates; no derived table to plan around
+    count_q = _with_employee_filters(
+        lambda_stmt(lambda: select(func.count()).select_from(Employee)),
+        org_id,
+        department,
+        status_filter,
+    )
     total = (await db.execute(count_q)).scalar() or 0
 
-    query = query.offset((page - 1) * page_size).limit(page_size)
+    offset = (page - 1) * page_size
+    query = _with_employee_filters(
+        lambda_stmt(lambda: select(Employee)), org_id, department, status_filter
+    )
+    query += lambda s: s.offset(offset).limit(page_size)
     result = await db.execute(query)
-    employees = result.scalars().all()
+    employees = _EMPLOYEE_LIST.validate_python(
+        result.scalars().all(), from_attributes=True
+    )
 
     return EmployeeListResponse(
         items=employees, total=total, page=page, page_size=page_size
@@ -106,20 +133,14 @@ async def create_employee(
 ):
     """Create a new employee record (admin/HR only)."""
     _require_admin(current_user)
-    employee = Employee(
-        organization_id=org_id,
-        full_name=data.full_name,
-        email=data.email,
-        employee_code=data.employee_code,
-        department=data.department,
-        position=data.position,
-        hire_date=data.hire_date,
-        status=data.status,
-        metadata_=data.metadata_,
+    # INSERT ... RETURNING loads the new row without a follow-up SELECT
+    result = await db.execute(
+        insert(Employee)
+        .values(organization_id=org_id, **data.model_dump())
+        .returning(Employee)
     )
-    db.add(employee)
-    await db.flush()
-    await db.refresh(employee)
+    employee = result.scalar_one()
+    await db.commit()
     return employee
 
 
@@ -133,20 +154,21 @@ async def update_employee(
 ):
     """Update an employee record (admin/HR only)."""
     _require_admin(current_user)
+    update_data = data.model_dump(exclude_unset=True)
+    if not update_data:
+        return await get_employee(employee_id, current_user, org_id, db)
+
+    # UPDATE ... RETURNING applies the change and loads the row at once
     result = await db.execute(
-        select(Employee).where(
-            Employee.id == employee_id, Employee.organization_id == org_id
-        )
+        update(Employee)
+        .where(Employee.id == employee_id, Employee.organization_id == org_id)
+        .values(**update_data)
+        .returning(Employee)
     )
     employee = result.scalar_one_or_none()
     if not employee:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Employee not found")
-
-    update_data = data.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(employee, field, value)
-
-    await db.flush()
-    await db.refresh(employee)
+    await db.commit()
+    # Cached agent replies may quote the old profile
+    invalidate_employee_replies(org_id, employee.id)
     return employee
-
@@ -2,7 +2,7 @@ from typing import Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import select
+from sqlalchemy import func, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.dependencies import get_current_user, get_current_tenant, get_db
@@ -16,12 +16,13 @@ from app.schemas.leave import (
     LeaveRequestResponse,
     LeaveRequestUpdate,
 )
+from app.services.agent.response_cache import invalidate_employee_replies
 
 router = APIRouter(prefix="/leave", tags=["leave"])
 
 
 def _require_admin(user: User) -> None:
-    if user.role not in ("admin", "hr_manager"):
+    if not user.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin or HR manager access required",
@@ -45,24 +46,26 @@ async def get_leave_balance(
     db: AsyncSession = Depends(get_db),
 ):
     """Get leave balances. Admins can specify employee_id; others see their own."""
-    if employee_id and current_user.role in ("admin", "hr_manager"):
+    if employee_id and current_user.is_admin:
         target_employee_id = employee_id
     else:
         target_employee_id = _get_employee_id(current_user)
 
     result = await db.execute(
-        select(LeaveBalance).where(
+        select(
+            LeaveBalance.id,
+            LeaveBalance.employee_id,
+            LeaveBalance.leave_type,
+            LeaveBalance.total_days,
+            LeaveBalance.used_days,
+            (LeaveBalance.total_days - LeaveBalance.used_days).label("remaining_days"),
+            LeaveBalance.year,
+        ).where(
             LeaveBalance.employee_id == target_employee_id,
             LeaveBalance.organization_id == org_id,
         )
     )
-    balances = result.scalars().all()
-    response = []
-    for b in balances:
-        resp = LeaveBalanceResponse.model_validate(b)
-        resp.remaining_days = b.total_days - b.used_days
-        response.append(resp)
-    return response
+    return [LeaveBalanceResponse.model_validate(row) for row in result.mappings()]
 
 
 @router.post("/request", response_model=LeaveRequestResponse, status_code=status.HTTP_201_CREATED)
@@ -74,17 +77,23 @@ async def submit_leave_request(
 ):
     """Submit a new leave request."""
     emp_id = _get_employee_id(current_user)
-    leave_request = LeaveRequest(
-        organization_id=org_id,
-        employee_id=emp_id,
-        leave_type=data.leave_type,
-        start_date=data.start_date,
-        end_date=data.end_date,
-        reason=data.reason,
+    # INSERT ... RETURNING loads the new row without a follow-up SELECT
+    result = await db.execute(
+        insert(LeaveRequest)
+        .values(
+            organization_id=org_id,
+            employee_id=emp_id,
+            leave_type=data.leave_type,
+            start_date=data.start_date,
+            end_date=data.end_date,
+            reason=data.reason,
+        )
+        .returning(LeaveRequest)
     )
-    db.add(leave_request)
-    await db.flush()
-    await db.refresh(leave_request)
+    leave_request = result.scalar_one()
+    await db.commit()
+    # Cached agent replies about this employee's leave are now stale
+    invalidate_employee_replies(org_id, emp_id)
     return leave_request
 
 
@@ -92,14 +101,16 @@ async def submit_leave_request(
 async def list_leave_requests(
     employee_id: Optional[UUID] = None,
     status_filter: Optional[str] = Query(None, alias="status"),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=200),
     current_user: User = Depends(get_current_user),
     org_id: UUID = Depends(get_current_tenant),
     db: AsyncSession = Depends(get_db),
 ):
-    """List leave requests. Admins see all for org; employees see their own."""
+    """List leave requests (paginated). Admins see all for org; employees see their own."""
     query = select(LeaveRequest).where(LeaveRequest.organization_id == org_id)
 
-    if current_user.role in ("admin", "hr_manager"):
+    if current_user.is_admin:
         if employee_id:
             query = query.where(LeaveRequest.employee_id == employee_id)
     else:
@@ -109,9 +120,16 @@ async def list_leave_requests(
     if status_filter:
         query = query.where(LeaveRequest.status == status_filter)
 
+    count_q = select(func.count()).select_from(query.subquery())
+    total = (await db.execute(count_q)).scalar() or 0
+
+    query = query.order_by(LeaveRequest.created_at.desc())
+    query = query.offset((page - 1) * page_size).limit(page_size)
     result = await db.execute(query)
     requests = result.scalars().all()
-    return LeaveRequestListResponse(items=requests, total=len(requests))
+    return LeaveRequestListResponse(
+        items=requests, total=total, page=page, page_size=page_size
+    )
 
 
 @router.patch("/requests/{request_id}", response_model=LeaveRequestResponse)
@@ -125,31 +143,41 @@ async def update_leave_request(
     """Approve or reject a leave request (admin/HR only)."""
     _require_admin(current_user)
 
+    if data.status not in ("approved", "rejected"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Status must be 'approved' or 'rejected'",
+        )
+
+    # The pending guard in the WHERE clause makes concurrent approvals race-free
     result = await db.execute(
-        select(LeaveRequest).where(
+        update(LeaveRequest)
+        .where(
             LeaveRequest.id == request_id,
             LeaveRequest.organization_id == org_id,
+            LeaveRequest.status == "pending",
         )
+        .values(status=data.status, approved_by=current_user.id)
+        .returning(LeaveRequest)
     )
     leave_req = result.scalar_one_or_none()
-    if not leave_req:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Leave request not found")
-
-    if leave_req.status != "pending":
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Cannot update a leave request with status '{leave_req.status}'",
-        )
-
-    if data.status not in ("approved", "rejected"):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Status must be 'approved' or 'rejected'",
+    if leave_req:
+        await db.commit()
+        invalidate_employee_replies(org_id, leave_req.employee_id)
+        return leave_req
+
+    # Nothing updated: either missing or no longer pending
+    current_status = (
+        await db.execute(
+            select(LeaveRequest.status).where(
+                LeaveRequest.id == request_id,
+                LeaveRequest.organization_id == org_id,
+            )
         )
-
-    leave_req.status = data.status
-    leave_req.approved_by = current_user.id
-    await db.flush()
-    await db.refresh(leave_req)
-    return leave_req
-
+    ).scalar_one_or_none()
+    if current_status is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Leave request not found")
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"Cannot update a leave request with status '{current_status}'",
+    )
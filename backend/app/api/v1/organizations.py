@@ -3,7 +3,8 @@
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import cast, func, select, text, update
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.v1.schemas import (
@@ -13,7 +14,12 @@ from app.api.v1.schemas import (
     UpdateApiConfigRequest,
     UpdateOrgRequest,
 )
-from app.core.dependencies import get_current_user, get_db
+from app.core.dependencies import (
+    get_current_org,
+    get_current_user,
+    get_db,
+    invalidate_cached_org,
+)
 from app.core.security import require_role
 from app.models.organization import Organization
 
@@ -25,16 +31,9 @@ router = APIRouter(prefix="/org", tags=["organization"])
 
 @router.get("", response_model=OrgResponse)
 async def get_org(
-    current_user=Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    org: Organization = Depends(get_current_org),
 ):
     """Get the current user's organization details."""
-    result = await db.execute(
-        select(Organization).where(Organization.id == current_user.organization_id)
-    )
-    org = result.scalar_one_or_none()
-    if not org:
-        raise HTTPException(status_code=404, detail="Organization not found")
     return org
 
 
@@ -48,18 +47,26 @@ async def update_org(
     db: AsyncSession = Depends(get_db),
 ):
     """Update organization settings (admin only)."""
-    result = await db.execute(
-        select(Organization).where(Organization.id == current_user.organization_id)
-    )
-    org = result.scalar_one_or_none()
+    patch = body.model_dump(exclude_none=True)
+    if patch:
+        # UPDATE ... RETURNING writes and reloads the row in one statement
+        org = (
+            await db.execute(
+                update(Organization)
+                .where(Organization.id == current_user.organization_id)
+                .values(**patch)
+                .returning(Organization)
+            )
+        ).scalar_one_or_none()
+    else:
+        org = await db.get(Organization, current_user.organization_id)
     if not org:
         raise HTTPException(status_code=404, detail="Organization not found")
 
-    if body.name is not None:
-        org.name = body.name
-    if body.settings is not None:
-        org.settings = body.settings
-
+    if patch:
+        await db.commit()
+        # Only after the commit, or a concurrent read could re-cache the old values
+        invalidate_cached_org(org.id)
     return org
 
 
@@ -74,13 +81,16 @@ async def update_api_config(
 ):
     """Update the HR system API endpoint configuration (admin only)."""
     result = await db.execute(
-        select(Organization).where(Organization.id == current_user.organization_id)
+        update(Organization)
+        .where(Organization.id == current_user.organization_id)
+        .values(api_config=body.api_config)
+        .returning(Organization)
     )
     org = result.scalar_one_or_none()
     if not org:
         raise HTTPException(status_code=404, detail="Organization not found")
-
-    org.api_config = body.api_config
+    await db.commit()
+    invalidate_cached_org(org.id)
     return org
 
 
@@ -94,12 +104,14 @@ async def get_ai_config(
 ):
     """Get the organization's AI provider configuration (API key masked)."""
     result = await db.execute(
-        select(Organization).where(Organization.id == current_user.organization_id)
+        select(Organization.settings).where(
+            Organization.id == current_user.organization_id
+        )
     )
-    org = result.scalar_one_or_none()
-    if not org:
+    row = result.one_or_none()
+    if row is None:
         raise HTTPException(status_code=404, detail="Organization not found")
-    return AIConfigResponse.from_settings(org.settings)
+    return AIConfigResponse.from_settings(row.settings)
 
 
 # ── PATCH /org/ai-config ─────────────────────────────────────────────────────
@@ -115,23 +127,39 @@ async def update_ai_config(
 
     Merges provided fields into the existing ai_config; omitted fields are unchanged.
     """
-    result = await db.execute(
-        select(Organization).where(Organization.id == current_user.organization_id)
-    )
-    org = result.scalar_one_or_none()
-    if not org:
-        raise HTTPException(status_code=404, detail="Organization not found")
-
-    # Merge into existing settings
-    current_settings = dict(org.settings) if org.settings else {}
-    current_ai = dict(current_settings.get("ai_config", {}))
-
     update_data = body.model_dump(exclude_none=True)
     # Strip empty strings — treat them as "not provided"
     update_data = {k: v for k, v in update_data.items() if v != ""}
-    current_ai.update(update_data)
-    current_settings["ai_config"] = current_ai
-    org.settings = current_settings
-
-    return AIConfigResponse.from_settings(org.settings)
 
+    if not update_data:
+        result = await db.execute(
+            select(Organization.settings).where(
+                Organization.id == current_user.organization_id
+            )
+        )
+    else:
+        # Merge in SQL so concurrent PATCHes cannot overwrite each other:
+        # settings = jsonb_set(settings, '{ai_config}', ai_config || patch)
+        empty = cast({}, JSONB)
+        current_ai = func.coalesce(Organization.settings["ai_config"], empty)
+        merged_ai = current_ai.op("||")(cast(update_data, JSONB))
+        result = await db.execute(
+            update(Organization)
+            .where(Organization.id == current_user.organization_id)
+            .values(
+                settings=func.jsonb_set(
+                    func.coalesce(Organization.settings, empty),
+                    text("'{ai_config}'::text[]"),
+                    merged_ai,
+                )
+            )
+            .returning(Organization.settings)
+        )
+
+    row = result.one_or_none()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Organization not found")
+    if update_data:
+        await db.commit()
+        invalidate_cached_org(current_user.organization_id)
+    return AIConfigResponse.from_settings(row.settings)
@@ -1,8 +1,9 @@
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import func, select
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import func, insert, lambda_stmt, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.dependencies import get_current_user, get_current_tenant, get_db
@@ -14,32 +15,102 @@ from app.schemas.policies import (
     PolicyResponse,
     PolicyUpdate,
 )
+from app.services.rag.index_version import bump_index_version
 
 router = APIRouter(prefix="/policies", tags=["policies"])
 
+# Characters of policy content included in list items
+POLICY_PREVIEW_CHARS = 300
+
+# Columns returned by writes; skips the embedding vector
+_POLICY_RETURNING = (
+    PolicyDocument.id,
+    PolicyDocument.organization_id,
+    PolicyDocument.title,
+    PolicyDocument.content,
+    PolicyDocument.category,
+    PolicyDocument.is_active,
+    PolicyDocument.updated_at,
+)
+
 
 def _require_admin(user: User) -> None:
-    if user.role not in ("admin", "hr_manager"):
+    if not user.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin or HR manager access required",
         )
 
 
-@router.get("", response_model=PolicyListResponse)
+async def _get_org_policy(
+    db: AsyncSession, policy_id: UUID, org_id: UUID
+) -> PolicyDocument:
+    """Load a policy by primary key (identity map first), scoped to the org."""
+    policy = await db.get(PolicyDocument, policy_id)
+    if not policy or policy.organization_id != org_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Policy not found"
+        )
+    return policy
+
+
+@router.get(
+    "",
+    response_model=None,
+    responses={200: {"model": PolicyListResponse}},
+)
 async def list_policies(
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=200),
+    include_total: bool = True,
     current_user: User = Depends(get_current_user),
     org_id: UUID = Depends(get_current_tenant),
     db: AsyncSession = Depends(get_db),
 ):
-    """List all active policies for the organization."""
-    query = select(PolicyDocument).where(
-        PolicyDocument.organization_id == org_id,
-        PolicyDocument.is_active.is_(True),
+    """List active policies for the organization (paginated).
+
+    Items carry a short content preview; fetch a single policy for its full
+    text. Pass ``include_total=false`` to skip the COUNT query. Rows come
+    straight from the database, so they are serialized without re-running
+    response-model validation.
+    """
+    offset = (page - 1) * page_size
+    query = lambda_stmt(
+        lambda: select(
+            PolicyDocument.id,
+            PolicyDocument.title,
+            PolicyDocument.category,
+            PolicyDocument.is_active,
+            PolicyDocument.updated_at,
+            func.left(PolicyDocument.content, POLICY_PREVIEW_CHARS).label(
+                "content_preview"
+            ),
+        )
+        .where(
+            PolicyDocument.organization_id == org_id,
+            PolicyDocument.is_active.is_(True),
+        )
+        # id breaks ties between rows stamped in the same transaction
+        .order_by(PolicyDocument.updated_at.desc(), PolicyDocument.id.desc())
+        .offset(offset)
+        .limit(page_size)
     )
     result = await db.execute(query)
-    policies = result.scalars().all()
-    return PolicyListResponse(items=policies, total=len(policies))
+    items = [dict(row) for row in result.mappings()]
+
+    total = None
+    if include_total:
+        count_q = lambda_stmt(
+            lambda: select(func.count()).select_from(PolicyDocument).where(
+                PolicyDocument.organization_id == org_id,
+                PolicyDocument.is_active.is_(True),
+            )
+        )
+        total = (await db.execute(count_q)).scalar() or 0
+
+    return ORJSONResponse(
+        {"items": items, "total": total, "page": page, "page_size": page_size}
+    )
 
 
 @router.get("/{policy_id}", response_model=PolicyResponse)
@@ -50,17 +121,7 @@ async def get_policy(
     db: AsyncSession = Depends(get_db),
 ):
     """Get a specific policy by ID."""
-    result = await db.execute(
-        select(PolicyDocument).where(
-            PolicyDocument.id == policy_id,
-            PolicyDocument.organization_id == org_id,
-        )
-    )
-    policy = result.scalar_one_or_none()
-    if not policy:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Policy not found"
-        )
+    policy = await _get_org_policy(db, policy_id, org_id)
     return policy
 
 
@@ -73,16 +134,13 @@ async def create_policy(
 ):
     """Create a new policy (admin/HR only)."""
     _require_admin(current_user)
-    policy = PolicyDocument(
-        organization_id=org_id,
-        title=data.title,
-        content=data.content,
-        category=data.category,
-        is_active=data.is_active,
+    result = await db.execute(
+        insert(PolicyDocument)
+        .values(organization_id=org_id, **data.model_dump())
+        .returning(*_POLICY_RETURNING)
     )
-    db.add(policy)
-    await db.flush()
-    await db.refresh(policy)
+    policy = PolicyResponse.model_validate(result.mappings().one())
+    await db.commit()
     return policy
 
 
@@ -96,23 +154,26 @@ async def update_policy(
 ):
     """Update a policy (admin/HR only)."""
     _require_admin(current_user)
+    update_data = data.model_dump(exclude_unset=True)
+    if not update_data:
+        return await _get_org_policy(db, policy_id, org_id)
+
     result = await db.execute(
-        select(PolicyDocument).where(
+        update(PolicyDocument)
+        .where(
             PolicyDocument.id == policy_id,
             PolicyDocument.organization_id == org_id,
         )
+        .values(**update_data)
+        .returning(*_POLICY_RETURNING)
     )
-    policy = result.scalar_one_or_none()
-    if not policy:
+    row = result.mappings().one_or_none()
+    if row is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Policy not found"
         )
-
-    update_data = data.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(policy, field, value)
-
-    await db.flush()
-    await db.refresh(policy)
+    policy = PolicyResponse.model_validate(row)
+    await db.commit()
+    # Edits and deactivation change what RAG queries may return
+    bump_index_version(org_id)
     return policy
-
@@ -3,19 +3,29 @@
 import logging
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from cachetools import TTLCache
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.dependencies import get_current_user, get_db
+from app.services.rag.index_version import bump_index_version, get_index_version
 from app.services.rag.pipeline import RAGPipeline
+from app.services.rag.retriever import RetrievedChunk
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/rag", tags=["rag"])
 
-# Shared pipeline instance
-_pipeline = RAGPipeline()
+
+def get_pipeline(request: Request) -> RAGPipeline:
+    """The shared pipeline created in the app lifespan."""
+    return request.app.state.rag_pipeline
+
+
+# Recent query results keyed by (org, index version, question, top_k)
+_query_cache: TTLCache = TTLCache(maxsize=2048, ttl=300)
 
 
 # --- Request / Response schemas ---
@@ -60,19 +70,20 @@ async def ingest_policy(
     policy_id: UUID,
     current_user=Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
+    pipeline: RAGPipeline = Depends(get_pipeline),
 ):
     """Ingest a policy document: chunk, embed, and store vectors.
 
     Requires admin or hr_manager role.
     """
-    if current_user.role not in ("admin", "hr_manager"):
+    if not current_user.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only admins and HR managers can ingest policies",
         )
 
     try:
-        chunks_created = await _pipeline.ingest(
+        chunks_created = await pipeline.ingest(
             db=db,
             policy_id=policy_id,
             organization_id=current_user.organization_id,
@@ -82,6 +93,8 @@ async def ingest_policy(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e),
         )
+    await db.commit()
+    bump_index_version(current_user.organization_id)
 
     return IngestResponse(
         policy_id=str(policy_id),
@@ -90,39 +103,44 @@ async def ingest_policy(
     )
 
 
-@router.post("/query", response_model=QueryResponse)
+@router.post(
+    "/query",
+    response_model=None,
+    responses={200: {"model": QueryResponse}},
+)
 async def query_knowledge_base(
     request: QueryRequest,
     current_user=Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
+    pipeline: RAGPipeline = Depends(get_pipeline),
 ):
     """Query the RAG knowledge base with a natural language question.
 
     Results are filtered to the user's organization (tenant isolation).
+
+    The RetrievedChunk dataclasses already match ``ChunkResult``, so orjson
+    serializes them directly (UUIDs included) without a pydantic pass.
+    Repeated questions within five minutes are served from a per-worker
+    cache without re-embedding.
     """
-    chunks = await _pipeline.query(
-        db=db,
-        question=request.question,
-        organization_id=current_user.organization_id,
-        top_k=request.top_k,
+    org_id = current_user.organization_id
+    cache_key = (
+        org_id,
+        get_index_version(org_id),
+        request.question.strip().lower(),
+        request.top_k,
     )
-
-    results = [
-        ChunkResult(
-            id=str(c.id),
-            policy_document_id=str(c.policy_document_id),
-            chunk_text=c.chunk_text,
-            chunk_index=c.chunk_index,
-            similarity=c.similarity,
-            metadata=c.metadata,
+    chunks: list[RetrievedChunk] | None = _query_cache.get(cache_key)
+    if chunks is None:
+        chunks = await pipeline.query(
+            db=db,
+            question=request.question,
+            organization_id=org_id,
+            top_k=request.top_k,
         )
-        for c in chunks
-    ]
-
-    return QueryResponse(
-        question=request.question,
-        results=results,
-        count=len(results),
+        _query_cache[cache_key] = chunks
+    return ORJSONResponse(
+        {"question": request.question, "results": chunks, "count": len(chunks)}
     )
 
 
@@ -130,6 +148,7 @@ async def query_knowledge_base(
 async def reindex_policies(
     current_user=Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
+    pipeline: RAGPipeline = Depends(get_pipeline),
 ):
     """Re-index all active policy documents for the organization.
 
@@ -141,10 +160,12 @@ async def reindex_policies(
             detail="Only admins can trigger a full re-index",
         )
 
-    total_chunks = await _pipeline.reindex(
+    total_chunks = await pipeline.reindex(
         db=db,
         organization_id=current_user.organization_id,
     )
+    await db.commit()
+    bump_index_version(current_user.organization_id)
 
     return ReindexResponse(
         total_chunks=total_chunks,
@@ -1,10 +1,10 @@
 """Pydantic schemas for auth and organization endpoints."""
 
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, Literal, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, model_validator
 
 
 # ── Auth Schemas ──────────────────────────────────────────────────────────────
@@ -47,7 +47,7 @@ class UserResponse(BaseModel):
     is_active: bool
     created_at: datetime
 
-    model_config = {"from_attributes": True}
+    model_config = {"from_attributes": True, "frozen": True}
 
 
 class InviteResponse(BaseModel):
@@ -67,7 +67,7 @@ class OrgResponse(BaseModel):
     api_config: Optional[dict[str, Any]] = None
     created_at: datetime
 
-    model_config = {"from_attributes": True}
+    model_config = {"from_attributes": True, "frozen": True}
 
 
 class UpdateOrgRequest(BaseModel):
@@ -81,13 +81,10 @@ class UpdateApiConfigRequest(BaseModel):
 
 # ── AI Config Schemas ────────────────────────────────────────────────────────
 
-_VALID_PROVIDERS = ("openai", "groq", "ollama")
-
-
 class AIConfigRequest(BaseModel):
     """Request schema for updating per-org AI configuration."""
 
-    provider: Optional[str] = Field(
+    provider: Optional[Literal["openai", "groq", "ollama"]] = Field(
         None,
         description="AI provider: openai, groq, or ollama",
     )
@@ -96,20 +93,18 @@ class AIConfigRequest(BaseModel):
     base_url: Optional[str] = Field(
         None, description="Custom base URL (required for ollama)"
     )
-    embedding_provider: Optional[str] = Field(
+    embedding_provider: Optional[Literal["openai", "ollama"]] = Field(
         None, description="Embedding provider: openai or ollama"
     )
     embedding_model: Optional[str] = Field(
         None, description="Embedding model name"
     )
 
-    def model_post_init(self, __context: Any) -> None:
-        if self.provider is not None and self.provider not in _VALID_PROVIDERS:
-            raise ValueError(
-                f"provider must be one of {', '.join(_VALID_PROVIDERS)}"
-            )
+    @model_validator(mode="after")
+    def _require_ollama_base_url(self) -> "AIConfigRequest":
         if self.provider == "ollama" and not self.base_url:
             raise ValueError("base_url is required when provider is 'ollama'")
+        return self
 
 
 def _mask_api_key(key: Optional[str]) -> Optional[str]:
@@ -129,6 +124,8 @@ class AIConfigResponse(BaseModel):
     embedding_provider: Optional[str] = None
     embedding_model: Optional[str] = None
 
+    model_config = {"frozen": True}
+
     @classmethod
     def from_settings(cls, settings: Optional[dict[str, Any]]) -> "AIConfigResponse":
         """Build response from the org settings dict, masking the API key."""
@@ -6,8 +6,18 @@ HMAC for Email/SendGrid).
 """
 
 import logging
-
-from fastapi import APIRouter, Form, Header, HTTPException, Request, status
+import re
+
+from cachetools import TTLCache
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Form,
+    Header,
+    HTTPException,
+    Request,
+    status,
+)
 from fastapi.responses import PlainTextResponse
 
 from app.core.config import settings
@@ -20,6 +30,56 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/webhooks", tags=["webhooks"])
 
+# The address part of a "Name <email>" sender
+_ANGLE_ADDR_RE = re.compile(r"<([^>]+)>")
+
+# Message ids accepted recently; providers retry deliveries they think timed out
+_seen_messages: TTLCache = TTLCache(maxsize=10_000, ttl=3600)
+
+
+def _is_duplicate(message_id: str) -> bool:
+    """Record a message id and report whether it was already accepted."""
+    if not message_id:
+        return False
+    if message_id in _seen_messages:
+        return True
+    _seen_messages[message_id] = True
+    return False
+
+
+def _forget(message_id: str) -> None:
+    """Un-record a message whose processing failed so a provider retry runs."""
+    if message_id:
+        _seen_messages.pop(message_id, None)
+
+
+async def _process_whatsapp(message_id: str, sender: str, body: str) -> None:
+    """Run the agent for a WhatsApp message after the webhook has returned."""
+    async with async_session_factory() as db:
+        try:
+            reply = await handle_whatsapp_message(db, sender, body)
+            await db.commit()
+            if reply is None:
+                logger.info("Unknown WhatsApp sender %s — no reply sent", sender)
+        except Exception:
+            await db.rollback()
+            _forget(message_id)
+            logger.exception("Error processing WhatsApp message")
+
+
+async def _process_email(message_id: str, sender: str, subject: str, body: str) -> None:
+    """Run the agent for an inbound email after the webhook has returned."""
+    async with async_session_factory() as db:
+        try:
+            reply = await handle_email_message(db, sender, subject, body)
+            await db.commit()
+            if reply is None:
+                logger.info("Unknown email sender %s — no reply sent", sender)
+        except Exception:
+            await db.rollback()
+            _forget(message_id)
+            logger.exception("Error processing inbound email")
+
 
 # ── WhatsApp (Twilio) Webhooks ────────────────────────────────────────────────
 
@@ -44,14 +104,17 @@ async def whatsapp_verify(
 @router.post("/whatsapp")
 async def whatsapp_inbound(
     request: Request,
+    background_tasks: BackgroundTasks,
     x_twilio_signature: str = Header("", alias="X-Twilio-Signature"),
 ):
     """Receive inbound WhatsApp messages from Twilio.
 
-    Twilio sends form-encoded POST data with the message details.
+    Twilio sends form-encoded POST data with the message details. The
+    message is handled in a background task so Twilio gets its 200 without
+    waiting on the agent.
     """
-    form_data = await request.form()
-    params = {k: v for k, v in form_data.items()}
+    # FormData is already a read-only mapping; no need to copy it
+    params = await request.form()
 
     # Verify Twilio signature in production
     if whatsapp_service.is_configured and settings.TWILIO_AUTH_TOKEN:
@@ -72,17 +135,11 @@ async def whatsapp_inbound(
         # Twilio expects 200 even for messages we can't process
         return PlainTextResponse("OK", status_code=200)
 
-    logger.info("WhatsApp message from %s: %s", sender, body[:100])
-
-    async with async_session_factory() as db:
-        try:
-            reply = await handle_whatsapp_message(db, sender, body)
-            await db.commit()
-            if reply is None:
-                logger.info("Unknown WhatsApp sender %s — no reply sent", sender)
-        except Exception:
-            await db.rollback()
-            logger.exception("Error processing WhatsApp message")
+    if _is_duplicate(parsed["message_sid"]):
+        logger.info("Duplicate WhatsApp message %s ignored", parsed["message_sid"])
+    else:
+        logger.info("WhatsApp message from %s: %s", sender, body[:100])
+        background_tasks.add_task(_process_whatsapp, parsed["message_sid"], sender, body)
 
     # Twilio expects a 200 response (TwiML or empty)
     return PlainTextResponse(
@@ -95,10 +152,11 @@ async def whatsapp_inbound(
 
 
 @router.post("/email")
-async def email_inbound(request: Request):
+async def email_inbound(request: Request, background_tasks: BackgroundTasks):
     """Receive inbound emails via SendGrid Inbound Parse.
 
-    SendGrid sends multipart form data with the parsed email fields.
+    SendGrid sends multipart form data with the parsed email fields. The
+    email is handled in a background task after the response is sent.
     """
     # Verify webhook signature if configured
     if settings.EMAIL_WEBHOOK_SECRET:
@@ -111,9 +169,7 @@ async def email_inbound(request: Request):
                 detail="Invalid signature",
             )
 
-    form_data = await request.form()
-    params = {k: v for k, v in form_data.items()}
-    parsed = email_service.parse_inbound(params)
+    parsed = email_service.parse_inbound(await request.form())
 
     sender = parsed["sender"]
     subject = parsed["subject"]
@@ -123,21 +179,17 @@ async def email_inbound(request: Request):
         logger.warning("Email webhook missing sender or body")
         return {"status": "ignored", "reason": "missing sender or body"}
 
+    if _is_duplicate(parsed["message_id"]):
+        logger.info("Duplicate inbound email %s ignored", parsed["message_id"])
+        return {"status": "ok"}
+
     logger.info("Inbound email from %s: subject=%s", sender, subject[:100] if subject else "(none)")
 
     # Extract just the email address if it's in "Name <email>" format
-    if "<" in sender and ">" in sender:
-        sender = sender.split("<")[1].split(">")[0]
-
-    async with async_session_factory() as db:
-        try:
-            reply = await handle_email_message(db, sender, subject, body)
-            await db.commit()
-            if reply is None:
-                logger.info("Unknown email sender %s — no reply sent", sender)
-        except Exception:
-            await db.rollback()
-            logger.exception("Error processing inbound email")
+    match = _ANGLE_ADDR_RE.search(sender)
+    if match:
+        sender = match.group(1)
 
+    background_tasks.add_task(_process_email, parsed["message_id"], sender, subject, body)
     return {"status": "ok"}
 
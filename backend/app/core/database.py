@@ -1,9 +1,34 @@
+import os
+import threading
+import time
+import uuid
+from typing import Any
+
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
 from app.core.config import settings
 
-engine = create_async_engine(settings.DATABASE_URL, echo=settings.DEBUG)
+
+def _json_serializer(value: Any) -> str:
+    """Encode JSON/JSONB parameters with orjson; int keys become strings like stdlib json."""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+engine = create_async_engine(
+    settings.DATABASE_URL,
+    echo=settings.DEBUG,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=True,
+    # Room for every distinct statement shape (lambda and plain) the app emits
+    query_cache_size=1200,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
+)
 
 async_session_factory = async_sessionmaker(
     engine,
@@ -15,3 +40,41 @@ async_session_factory = async_sessionmaker(
 class Base(DeclarativeBase):
     pass
 
+
+# Last (millisecond, counter) handed out by uuid7, so ids generated by this
+# process are strictly increasing even within one millisecond
+_uuid7_state = [0, 0]
+_uuid7_lock = threading.Lock()
+
+
+def uuid7() -> uuid.UUID:
+    """Generate a time-ordered UUIDv7 (RFC 9562).
+
+    48-bit Unix timestamp in milliseconds, a 12-bit counter (RFC 9562
+    method 1) and 62 random bits, so consecutive inserts land on
+    neighbouring B-tree pages. Within a millisecond the counter increments,
+    which keeps rows inserted together (e.g. a chat turn) in id order when
+    their timestamps tie.
+    """
+    with _uuid7_lock:
+        unix_ts_ms = time.time_ns() // 1_000_000
+        last_ms, counter = _uuid7_state
+        if unix_ts_ms <= last_ms:
+            # Same millisecond (or the clock stepped back): keep counting
+            unix_ts_ms, counter = last_ms, counter + 1
+            if counter > 0xFFF:
+                unix_ts_ms, counter = last_ms + 1, 0
+        else:
+            # Random start in the lower half leaves room to increment
+            counter = int.from_bytes(os.urandom(2), "big") & 0x7FF
+        _uuid7_state[:] = (unix_ts_ms, counter)
+
+    rand_b = int.from_bytes(os.urandom(8), "big") & 0x3FFF_FFFF_FFFF_FFFF
+    value = (
+        (unix_ts_ms & 0xFFFF_FFFF_FFFF) << 80
+        | 0x7 << 76
+        | counter << 64
+        | 0b10 << 62
+        | rand_b
+    )
+    return uuid.UUID(int=value)
@@ -1,22 +1,47 @@
 from typing import AsyncGenerator
 from uuid import UUID
 
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
 from app.core.database import async_session_factory
 from app.core.security import decode_access_token
 
 security_scheme = HTTPBearer()
 
+# Detached User rows (with their Organization) keyed by id, stored with the
+# org's generation at caching time. Short TTL bounds how long a role,
+# is_active or org change can take to be seen by this worker.
+_user_cache: TTLCache = TTLCache(maxsize=50_000, ttl=30)
+
+# Bumped by invalidate_cached_org; cached users from an older generation are
+# reloaded, so invalidating an org never scans the user cache
+_org_generations: dict[UUID, int] = {}
+
+
+def get_org_generation(org_id: UUID) -> int:
+    """The org's current generation; compare it with one stored earlier."""
+    return _org_generations.get(org_id, 0)
+
+
+def invalidate_cached_org(org_id: UUID) -> None:
+    """Drop every cached user of an org after changing the organization row."""
+    _org_generations[org_id] = _org_generations.get(org_id, 0) + 1
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """Yield a session; write endpoints commit explicitly.
+
+    Read-only requests end without a COMMIT round trip — the transaction is
+    rolled back when the session closes.
+    """
     async with async_session_factory() as session:
         try:
             yield session
-            await session.commit()
         except Exception:
             await session.rollback()
             raise
@@ -43,8 +68,21 @@ async def get_current_user(
             detail="Invalid token payload",
         )
 
-    result = await db.execute(select(User).where(User.id == UUID(user_id)))
-    user = result.scalar_one_or_none()
+    user_uuid = UUID(user_id)
+    cached = _user_cache.get(user_uuid)
+    if cached is not None:
+        user, generation = cached
+        if generation == get_org_generation(user.organization_id):
+            # Attach a copy to this session without emitting SQL
+            return await db.merge(user, load=False)
+
+    # Load the organization in the same round trip; its own collections
+    # are never needed on the auth path.
+    user = await db.scalar(
+        select(User)
+        .options(joinedload(User.organization).raiseload("*"))
+        .where(User.id == user_uuid)
+    )
 
     if user is None or not user.is_active:
         raise HTTPException(
@@ -52,7 +90,14 @@ async def get_current_user(
             detail="User not found or inactive",
         )
 
-    return user
+    generation = get_org_generation(user.organization_id)
+    # expunge does not cascade to the organization; detach it too so the
+    # cached copy never points back into this request's session
+    if user.organization is not None:
+        db.expunge(user.organization)
+    db.expunge(user)
+    _user_cache[user_uuid] = (user, generation)
+    return await db.merge(user, load=False)
 
 
 async def get_current_tenant(
@@ -60,3 +105,10 @@ async def get_current_tenant(
 ) -> UUID:
     return current_user.organization_id
 
+
+async def get_current_org(current_user=Depends(get_current_user)):
+    """The current user's organization, loaded alongside the user."""
+    org = current_user.organization
+    if org is None:
+        raise HTTPException(status_code=404, detail="Organization not found")
+    return org
@@ -1,21 +1,46 @@
-from datetime import datetime, timedelta, timezone
+import hashlib
+import time
+from datetime import UTC, datetime, timedelta
 from typing import Any, Optional
 
+import bcrypt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, status
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Read once; settings are frozen
+JWT_SECRET = settings.JWT_SECRET
+JWT_ALGORITHM = settings.JWT_ALGORITHM
+_JWT_ALGORITHMS = [JWT_ALGORITHM]
+_DEFAULT_TOKEN_TTL = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+
+# New hashes use argon2id; existing bcrypt hashes still verify
+_argon2 = PasswordHasher(time_cost=3, memory_cost=65536, parallelism=4)
+
+# Verified JWT payloads keyed by a digest of the token, so raw bearer
+# tokens are not held in memory
+_token_cache: TTLCache = TTLCache(maxsize=10_000, ttl=300)
+
+
+def _token_key(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
 
 
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return _argon2.hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    if hashed_password.startswith("$2"):
+        return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
+    try:
+        return _argon2.verify(hashed_password, plain_password)
+    except (VerificationError, InvalidHashError):
+        return False
 
 
 def create_access_token(
@@ -23,24 +48,34 @@ def create_access_token(
 ) -> str:
     """Create a JWT with sub (user_id), org_id, and role claims."""
     to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
-    else:
-        expire = datetime.now(timezone.utc) + timedelta(
-            minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
-        )
+    expire = datetime.now(UTC) + (expires_delta or _DEFAULT_TOKEN_TTL)
     to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
+    return jwt.encode(to_encode, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
 
 def decode_access_token(token: str) -> dict[str, Any]:
+    """Verify a JWT and return its claims.
+
+    Verified payloads are cached by a digest of the token (which is
+    immutable), so a client reusing its token skips signature verification;
+    ``exp`` is still checked on every call. The returned dict is shared —
+    treat it as read-only.
+    """
+    key = _token_key(token)
+    payload = _token_cache.get(key)
+    if payload is not None:
+        if payload["exp"] > time.time():
+            return payload
+        _token_cache.pop(key, None)
+        raise ValueError("Invalid token")
+
     try:
-        payload = jwt.decode(
-            token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM]
-        )
-        return payload
+        payload = jwt.decode(token, JWT_SECRET, algorithms=_JWT_ALGORITHMS)
     except JWTError:
         raise ValueError("Invalid token")
+    if "exp" in payload:
+        _token_cache[key] = payload
+    return payload
 
 
 def require_role(*allowed_roles: str):
@@ -55,8 +90,10 @@ def require_role(*allowed_roles: str):
     """
     from app.core.dependencies import get_current_user
 
+    allowed = frozenset(allowed_roles)
+
     async def role_checker(current_user=Depends(get_current_user)):
-        if current_user.role not in allowed_roles:
+        if current_user.role not in allowed:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Role '{current_user.role}' is not authorized. Required: {', '.join(allowed_roles)}",
@@ -2,19 +2,30 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.core.config import settings
 from app.middleware.tenant import TenantMiddleware
+from app.models import load_all
+
+# Mappers resolve relationships by class name; register them all up front
+load_all()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: launch the alert scheduler
+    # Startup: launch the alert scheduler and the RAG pipeline
+    from app.services.agent.provider_factory import close_http_client
     from app.services.alerts.scheduler import start_scheduler, stop_scheduler
+    from app.services.rag.pipeline import RAGPipeline
     start_scheduler()
+    # Shared RAG pipeline, warmed before the first request arrives
+    app.state.rag_pipeline = RAGPipeline()
+    await app.state.rag_pipeline.warmup()
     yield
-    # Shutdown: stop the alert scheduler
+    # Shutdown: stop the alert scheduler and release pooled LLM connections
     stop_scheduler()
+    await close_http_client()
 
 
 app = FastAPI(
@@ -23,6 +34,7 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Middleware (order matters — outermost first)
@@ -5,55 +5,101 @@ in a request-scoped context variable so that downstream code can use
 `get_current_tenant` to filter queries by organization.
 """
 
+import re
 from contextvars import ContextVar
+from functools import lru_cache
 from typing import Optional
 from uuid import UUID
 
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from app.core.security import decode_access_token
 
 # Context variable holding the current tenant's org_id for the request
 _current_org_id: ContextVar[Optional[UUID]] = ContextVar("current_org_id", default=None)
 
+# Compact JWS shape: three base64url segments. Anything else is not a token.
+_JWT_RE = re.compile(r"[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+")
+
+# Paths that never carry tenant credentials
+_PUBLIC_PREFIXES = ("/health", "/docs", "/openapi.json", "/redoc")
+
+
+@lru_cache(maxsize=4096)
+def _uuid(value: str) -> UUID:
+    """Parse an org_id once; org ids repeat across tokens."""
+    return UUID(value)
+
+
+def _org_id_from_token(token: str) -> Optional[UUID]:
+    """Return the org_id claim of a valid token.
+
+    ``decode_access_token`` already caches verified payloads, so repeated
+    tokens skip signature checks there.
+    """
+    raw_org_id = decode_access_token(token).get("org_id")
+    return _uuid(raw_org_id) if isinstance(raw_org_id, str) and raw_org_id else None
+
+
+def _bearer_token(headers: list[tuple[bytes, bytes]]) -> str:
+    """Return the Bearer token from raw ASGI headers, or "" if there is none.
+
+    ASGI servers lowercase header names, so a bytes compare on the raw list
+    avoids building a ``Headers`` wrapper and decoding every header.
+    """
+    for name, value in headers:
+        if name == b"authorization":
+            auth_header = value.decode("latin-1")
+            token = auth_header.removeprefix("Bearer ")
+            return token if token is not auth_header else ""
+    return ""
+
+
+def _extract_org(token: str) -> Optional[UUID]:
+    """Return the org_id of a Bearer token, or None if it is not valid."""
+    if not _JWT_RE.fullmatch(token):
+        return None
+    try:
+        return _org_id_from_token(token)
+    except ValueError:
+        # Invalid token or org_id — endpoint-level auth handles the 401
+        return None
+
 
 def get_request_org_id() -> Optional[UUID]:
     """Return the org_id extracted from the JWT for the current request."""
     return _current_org_id.get()
 
 
-class TenantMiddleware(BaseHTTPMiddleware):
+class TenantMiddleware:
     """Extract org_id from the Authorization header and set it in context.
 
-    This runs on every request. If the request has a valid Bearer token with
-    an org_id claim, the org_id is stored in a context variable. Public
-    endpoints (no token) simply proceed with org_id = None.
+    Pure ASGI middleware: no per-request task group or body streams. Public
+    paths, CORS preflights and requests without a Bearer token skip JWT work
+    entirely; only requests with a valid org_id touch the context variable.
     """
 
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
-        org_id: Optional[UUID] = None
-
-        auth_header = request.headers.get("authorization", "")
-        if auth_header.startswith("Bearer "):
-            token = auth_header[7:]
-            try:
-                payload = decode_access_token(token)
-                raw_org_id = payload.get("org_id")
-                if raw_org_id:
-                    org_id = UUID(raw_org_id)
-            except (ValueError, Exception):
-                # Invalid token — let the endpoint-level auth handle the 401
-                pass
-
-        token = _current_org_id.set(org_id)
-        try:
-            response = await call_next(request)
-        finally:
-            _current_org_id.reset(token)
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] == "OPTIONS"
+            or scope["path"].startswith(_PUBLIC_PREFIXES)
+        ):
+            await self.app(scope, receive, send)
+            return
 
-        return response
+        token = _bearer_token(scope["headers"])
+        org_id = _extract_org(token) if token else None
+        if org_id is None:
+            # The ContextVar already defaults to None; nothing to set or reset
+            await self.app(scope, receive, send)
+            return
 
+        reset_token = _current_org_id.set(org_id)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_org_id.reset(reset_token)
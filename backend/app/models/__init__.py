@@ -1,15 +1,44 @@
-from app.models.organization import Organization
-from app.models.user import User
-from app.models.employee import Employee
-from app.models.leave_balance import LeaveBalance
-from app.models.leave_request import LeaveRequest
-from app.models.document import Document
-from app.models.policy_document import PolicyDocument
-from app.models.conversation import Conversation
-from app.models.message import Message
-from app.models.alert_config import AlertConfig
-from app.models.alert_event import AlertEvent
-from app.models.policy_chunk import PolicyChunk
+"""ORM models, resolved lazily (PEP 562).
+
+``from app.models import User`` imports only the module that defines it.
+Relationships reference other models by name, so anything that queries the
+ORM must call ``load_all()`` first so every mapper is registered.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    # Static view of the lazy exports for type checkers and IDEs
+    from app.models.alert_config import AlertConfig
+    from app.models.alert_event import AlertEvent
+    from app.models.conversation import Conversation
+    from app.models.document import Document
+    from app.models.employee import Employee
+    from app.models.invite import Invite
+    from app.models.leave_balance import LeaveBalance
+    from app.models.leave_request import LeaveRequest
+    from app.models.message import Message
+    from app.models.organization import Organization
+    from app.models.policy_chunk import PolicyChunk
+    from app.models.policy_document import PolicyDocument
+    from app.models.user import User
+
+_LAZY = {
+    "Organization": "app.models.organization",
+    "User": "app.models.user",
+    "Employee": "app.models.employee",
+    "LeaveBalance": "app.models.leave_balance",
+    "LeaveRequest": "app.models.leave_request",
+    "Document": "app.models.document",
+    "PolicyDocument": "app.models.policy_document",
+    "PolicyChunk": "app.models.policy_chunk",
+    "Conversation": "app.models.conversation",
+    "Message": "app.models.message",
+    "AlertConfig": "app.models.alert_config",
+    "AlertEvent": "app.models.alert_event",
+    "Invite": "app.models.invite",
+}
 
 __all__ = [
     "Organization",
@@ -24,5 +53,25 @@ __all__ = [
     "Message",
     "AlertConfig",
     "AlertEvent",
+    "Invite",
 ]
 
+
+def __getattr__(name: str) -> Any:
+    try:
+        module = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
+
+
+def load_all() -> None:
+    """Import every model module so Base.metadata and the mapper registry are complete."""
+    for name in __all__:
+        __getattr__(name)
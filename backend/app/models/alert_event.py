@@ -1,18 +1,27 @@
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, String
+from sqlalchemy import DateTime, ForeignKey, Index, String, func, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.core.database import Base
+from app.core.database import Base, uuid7
 
 
 class AlertEvent(Base):
     __tablename__ = "alert_events"
+    __table_args__ = (
+        # Live working set only; resolved events dominate the table
+        Index(
+            "ix_alert_events_live",
+            "organization_id",
+            text("created_at DESC"),
+            postgresql_where=text("status <> 'resolved'"),
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+        UUID(as_uuid=True), primary_key=True, default=uuid7
     )
     alert_config_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("alert_configs.id"), nullable=False
@@ -28,7 +37,7 @@ class AlertEvent(Base):
     )  # triggered, in_progress, resolved
     context: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+        DateTime(timezone=True), server_default=func.now()
     )
     resolved_at: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True), nullable=True
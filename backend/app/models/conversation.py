@@ -1,18 +1,18 @@
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, String
+from sqlalchemy import DateTime, ForeignKey, String, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.core.database import Base
+from app.core.database import Base, uuid7
 
 
 class Conversation(Base):
     __tablename__ = "conversations"
 
     id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+        UUID(as_uuid=True), primary_key=True, default=uuid7
     )
     organization_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False
@@ -27,7 +27,7 @@ class Conversation(Base):
         String(50), nullable=False, default="active"
     )  # active, closed
     started_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+        DateTime(timezone=True), server_default=func.now()
     )
     ended_at: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True), nullable=True
@@ -35,5 +35,10 @@ class Conversation(Base):
 
     # Relationships
     employee = relationship("Employee", back_populates="conversations")
-    messages = relationship("Message", back_populates="conversation", lazy="selectin")
+    messages = relationship(
+        "Message",
+        back_populates="conversation",
+        lazy="raise_on_sql",
+        order_by="(Message.created_at, Message.id)",
+    )
 
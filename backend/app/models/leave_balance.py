@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import Float, ForeignKey, Integer, String
+from sqlalchemy import Float, ForeignKey, Integer, String, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -9,6 +9,14 @@ from app.core.database import Base
 
 class LeaveBalance(Base):
     __tablename__ = "leave_balances"
+    __table_args__ = (
+        UniqueConstraint(
+            "employee_id",
+            "year",
+            "leave_type",
+            name="uq_leave_balances_employee_year_type",
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -1,7 +1,7 @@
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime
 
-from sqlalchemy import DateTime, String, Text
+from sqlalchemy import DateTime, String, Text, func
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -19,10 +19,10 @@ class Organization(Base):
     settings: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
     api_config: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+        DateTime(timezone=True), server_default=func.now()
     )
 
     # Relationships
-    users = relationship("User", back_populates="organization", lazy="selectin")
-    employees = relationship("Employee", back_populates="organization", lazy="selectin")
+    users = relationship("User", back_populates="organization", lazy="raise_on_sql")
+    employees = relationship("Employee", back_populates="organization", lazy="raise_on_sql")
 
@@ -1,19 +1,19 @@
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime
 
-from pgvector.sqlalchemy import Vector
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text
+from pgvector.sqlalchemy import HALFVEC
+from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, func
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.core.database import Base
+from app.core.database import Base, uuid7
 
 
 class PolicyChunk(Base):
     __tablename__ = "policy_chunks"
 
     id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+        UUID(as_uuid=True), primary_key=True, default=uuid7
     )
     policy_document_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -27,12 +27,15 @@ class PolicyChunk(Base):
     )
     chunk_text: Mapped[str] = mapped_column(Text, nullable=False)
     chunk_index: Mapped[int] = mapped_column(Integer, nullable=False)
-    embedding = mapped_column(Vector(1536), nullable=True)
+    # ~3 KB per row; only the retriever's Core query reads it
+    embedding = mapped_column(
+        HALFVEC(1536), nullable=True, deferred=True, deferred_raiseload=True
+    )
     metadata_: Mapped[dict | None] = mapped_column(
         "metadata", JSONB, nullable=True
     )
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+        DateTime(timezone=True), server_default=func.now()
     )
 
     # Relationships
@@ -1,15 +1,23 @@
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime
+from functools import cached_property
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, String
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, String, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
 
+# Roles allowed to manage the organization's HR data
+ADMIN_ROLES = frozenset({"admin", "hr_manager"})
+
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Emails are unique case-insensitively; lookups use lower(email)
+        Index("users_email_lower_idx", text("lower(email)"), unique=True),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -17,7 +25,7 @@ class User(Base):
     organization_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False
     )
-    email: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
+    email: Mapped[str] = mapped_column(String(255), nullable=False)
     hashed_password: Mapped[str] = mapped_column(String(255), nullable=False)
     role: Mapped[str] = mapped_column(
         String(50), nullable=False, default="employee"
@@ -28,10 +36,14 @@ class User(Base):
     )
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+        DateTime(timezone=True), server_default=func.now()
     )
 
     # Relationships
     organization = relationship("Organization", back_populates="users")
     employee = relationship("Employee", foreign_keys=[employee_id])
 
+    @cached_property
+    def is_admin(self) -> bool:
+        """Whether the user holds an admin or HR manager role."""
+        return self.role in ADMIN_ROLES
@@ -21,6 +21,8 @@ class DocumentResponse(BaseModel):
 class DocumentListResponse(BaseModel):
     items: list[DocumentResponse]
     total: int
+    page: int
+    page_size: int
 
 
 class DocumentGenerateRequest(BaseModel):
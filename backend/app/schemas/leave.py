@@ -46,4 +46,6 @@ class LeaveRequestResponse(BaseModel):
 class LeaveRequestListResponse(BaseModel):
     items: list[LeaveRequestResponse]
     total: int
+    page: int
+    page_size: int
 
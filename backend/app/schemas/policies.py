@@ -31,7 +31,20 @@ class PolicyResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class PolicyListItem(BaseModel):
+    id: UUID
+    title: str
+    category: Optional[str] = None
+    is_active: bool
+    updated_at: datetime
+    content_preview: str
+
+    model_config = {"from_attributes": True}
+
+
 class PolicyListResponse(BaseModel):
-    items: list[PolicyResponse]
-    total: int
+    items: list[PolicyListItem]
+    total: Optional[int] = None
+    page: int
+    page_size: int
 
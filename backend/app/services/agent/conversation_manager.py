@@ -4,19 +4,64 @@ Persists chat history to the database for the AI agent.
 """
 
 import logging
-from datetime import datetime, timezone
+from dataclasses import dataclass
+from datetime import UTC, datetime
 from typing import Any, Optional
 from uuid import UUID
 
-from sqlalchemy import select
+from cachetools import TTLCache
+from sqlalchemy import Row, Select, func, insert, lambda_stmt, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import raiseload, selectinload
 
 from app.models.conversation import Conversation
 from app.models.message import Message
 
 logger = logging.getLogger(__name__)
 
+# Keyset cursor over a conversation's messages: (created_at, id)
+MessageCursor = tuple[datetime, UUID]
+
+
+@dataclass(frozen=True, slots=True)
+class ConversationHeader:
+    """The fields chat endpoints check before every turn."""
+
+    id: UUID
+    employee_id: UUID
+    status: str
+
+
+# Headers keyed by (org_id, conversation_id), shared by every manager in the
+# process. invalidate_header drops an entry once a close has committed;
+# other workers see the change within the TTL.
+_header_cache: TTLCache = TTLCache(maxsize=1024, ttl=30)
+
+
+def _history_query(
+    query: Select,
+    conversation_id: UUID,
+    limit: Optional[int],
+    after: Optional[MessageCursor],
+) -> Select:
+    """Scope a message query to one conversation, keyset cursor and limit.
+
+    With a limit the newest rows are selected (descending); callers restore
+    chronological order with ``_oldest_first``.
+    """
+    query = query.where(Message.conversation_id == conversation_id)
+    if after is not None:
+        query = query.where(tuple_(Message.created_at, Message.id) > tuple_(*after))
+    if limit is None:
+        return query.order_by(Message.created_at.asc(), Message.id.asc())
+    return query.order_by(Message.created_at.desc(), Message.id.desc()).limit(limit)
+
+
+def _oldest_first(items: list, limit: Optional[int]) -> list:
+    if limit is not None:
+        items.reverse()
+    return items
+
 
 class ConversationManager:
     """Manage conversations and messages for the HR agent."""
@@ -46,11 +91,22 @@ class ConversationManager:
         db: AsyncSession,
         conversation_id: UUID,
         organization_id: UUID,
+        load_messages: bool = False,
     ) -> Optional[Conversation]:
-        """Get a conversation by ID with messages loaded."""
+        """Get a conversation by ID.
+
+        Messages are only loaded (in one batched query, oldest first, with
+        their deferred ``tool_calls``) when ``load_messages`` is set;
+        otherwise accessing them raises.
+        """
+        loader = (
+            selectinload(Conversation.messages).undefer(Message.tool_calls)
+            if load_messages
+            else raiseload(Conversation.messages)
+        )
         result = await db.execute(
             select(Conversation)
-            .options(selectinload(Conversation.messages))
+            .options(loader)
             .where(
                 Conversation.id == conversation_id,
                 Conversation.organization_id == organization_id,
@@ -58,22 +114,62 @@ class ConversationManager:
         )
         return result.scalar_one_or_none()
 
+    async def get_conversation_header(
+        self,
+        db: AsyncSession,
+        conversation_id: UUID,
+        organization_id: UUID,
+    ) -> Optional[ConversationHeader]:
+        """Get a conversation's owner and status, cached for repeated turns."""
+        key = (organization_id, conversation_id)
+        header = _header_cache.get(key)
+        if header is not None:
+            return header
+
+        result = await db.execute(
+            select(Conversation.id, Conversation.employee_id, Conversation.status).where(
+                Conversation.id == conversation_id,
+                Conversation.organization_id == organization_id,
+            )
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
+        header = ConversationHeader(*row)
+        _header_cache[key] = header
+        return header
+
     async def list_conversations(
         self,
         db: AsyncSession,
         organization_id: UUID,
         employee_id: UUID,
-    ) -> list[Conversation]:
-        """List all conversations for an employee."""
+        page: int = 1,
+        page_size: int = 20,
+    ) -> tuple[list[Conversation], int]:
+        """List one page of an employee's conversations, newest first.
+
+        Returns the page and the total number of conversations, fetched
+        together via a window count.
+        """
+        offset = (page - 1) * page_size
+        # lambda_stmt caches statement construction and its cache key
         result = await db.execute(
-            select(Conversation)
-            .where(
-                Conversation.organization_id == organization_id,
-                Conversation.employee_id == employee_id,
+            lambda_stmt(
+                lambda: select(Conversation, func.count().over().label("total"))
+                .options(raiseload(Conversation.messages))
+                .where(
+                    Conversation.organization_id == organization_id,
+                    Conversation.employee_id == employee_id,
+                )
+                .order_by(Conversation.started_at.desc())
+                .offset(offset)
+                .limit(page_size)
             )
-            .order_by(Conversation.started_at.desc())
         )
-        return list(result.scalars().all())
+        rows = result.all()
+        total = rows[0].total if rows else 0
+        return [row[0] for row in rows], total
 
     async def add_message(
         self,
@@ -94,18 +190,68 @@ class ConversationManager:
         await db.flush()
         return message
 
+    async def add_messages(
+        self,
+        db: AsyncSession,
+        conversation_id: UUID,
+        messages: list[dict[str, Any]],
+    ) -> list[UUID]:
+        """Add several messages in one INSERT ... RETURNING round trip.
+
+        Each item has ``role``, ``content`` and optionally ``tool_calls``.
+        Ids are generated in list order and uuid7 is monotonic, so history
+        ordered by ``(created_at, id)`` keeps list order when timestamps tie.
+        Returns the new message ids.
+        """
+        if not messages:
+            return []
+        result = await db.execute(
+            insert(Message).returning(Message.id),
+            [
+                {
+                    "conversation_id": conversation_id,
+                    "role": m["role"],
+                    "content": m["content"],
+                    "tool_calls": m.get("tool_calls"),
+                }
+                for m in messages
+            ],
+        )
+        return list(result.scalars().all())
+
     async def get_conversation_history(
         self,
         db: AsyncSession,
         conversation_id: UUID,
+        limit: Optional[int] = None,
+        after: Optional[MessageCursor] = None,
     ) -> list[Message]:
-        """Get all messages in a conversation, ordered by creation time."""
+        """Get messages in a conversation as ORM objects, oldest first.
+
+        Use this only where messages are mutated; prompt building should use
+        ``get_conversation_history_rows``. ``tool_calls`` stays deferred.
+        """
         result = await db.execute(
-            select(Message)
-            .where(Message.conversation_id == conversation_id)
-            .order_by(Message.created_at.asc())
+            _history_query(select(Message), conversation_id, limit, after)
         )
-        return list(result.scalars().all())
+        return _oldest_first(list(result.scalars().all()), limit)
+
+    async def get_conversation_history_rows(
+        self,
+        db: AsyncSession,
+        conversation_id: UUID,
+        limit: Optional[int] = None,
+        after: Optional[MessageCursor] = None,
+    ) -> list[Row]:
+        """Get ``(id, role, content, created_at)`` rows, oldest first.
+
+        Plain rows skip ORM hydration and identity-map bookkeeping.
+        ``after`` is a ``(created_at, id)`` keyset cursor; only newer messages
+        are returned. ``limit`` keeps just the most recent ``limit`` of them.
+        """
+        query = select(Message.id, Message.role, Message.content, Message.created_at)
+        result = await db.execute(_history_query(query, conversation_id, limit, after))
+        return _oldest_first(list(result.all()), limit)
 
     async def close_conversation(
         self,
@@ -113,13 +259,22 @@ class ConversationManager:
         conversation_id: UUID,
         organization_id: UUID,
     ) -> Optional[Conversation]:
-        """Close a conversation."""
+        """Close a conversation.
+
+        The caller commits, then calls ``invalidate_header`` so a concurrent
+        turn cannot re-cache the still-open header in between.
+        """
         conversation = await self.get_conversation(db, conversation_id, organization_id)
         if conversation is None:
             return None
         conversation.status = "closed"
-        conversation.ended_at = datetime.now(timezone.utc)
+        conversation.ended_at = datetime.now(UTC)
         await db.flush()
         logger.info("Closed conversation %s", conversation_id)
         return conversation
 
+    @staticmethod
+    def invalidate_header(organization_id: UUID, conversation_id: UUID) -> None:
+        """Drop a cached header after its conversation's changes are committed."""
+        _header_cache.pop((organization_id, conversation_id), None)
+
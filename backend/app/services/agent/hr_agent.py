@@ -3,22 +3,29 @@
 Falls back to mock/canned responses when no AI provider is configured.
 """
 
-import json
 import logging
+import re
+from functools import lru_cache
 from typing import Any, AsyncGenerator
 from uuid import UUID
 
+import orjson
+from cachetools import TTLCache
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langgraph.prebuilt import create_react_agent
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.services.agent.conversation_manager import ConversationManager
 from app.services.agent.provider_factory import get_chat_model, get_default_ai_config
-from app.services.agent.tools import get_langchain_tools
+from app.services.agent.response_cache import SemanticResponseCache, get_response_cache
+from app.services.agent.tools import LANGCHAIN_TOOLS, bind_tool_context
 
 logger = logging.getLogger(__name__)
 
-SYSTEM_PROMPT_TEMPLATE = """You are an AI HR assistant for {org_name}. You help employees with HR-related questions and tasks.
+# Identical bytes on every request so providers can cache the prompt prefix;
+# anything organization-specific goes in ORG_CONTEXT_TEMPLATE after it
+SYSTEM_PROMPT_STATIC = """You are an AI HR assistant for the organization named below. You help employees with HR-related questions and tasks.
 
 Your capabilities:
 - Check leave balances and submit leave requests
@@ -35,6 +42,36 @@ Guidelines:
 - For leave requests, confirm the details with the employee before submitting.
 """
 
+ORG_CONTEXT_TEMPLATE = "Organization: {org_name}"
+
+# Shared across turns; the fixed ids keep LangGraph's message reducer from
+# assigning (i.e. writing) one on each run
+_STATIC_SYSTEM_MESSAGE = SystemMessage(content=SYSTEM_PROMPT_STATIC, id="system-static")
+
+
+@lru_cache(maxsize=256)
+def _org_context_message(org_name: str) -> SystemMessage:
+    """Build the per-organization system message once per name."""
+    return SystemMessage(
+        content=ORG_CONTEXT_TEMPLATE.format(org_name=org_name), id="system-org-context"
+    )
+
+
+# Most recent messages replayed to the LLM each turn
+HISTORY_LIMIT = 50
+
+# Start of the replayed history window per conversation, as the keyset cursor
+# of the last message dropped from it. The window only advances (by half)
+# when it fills up, so consecutive turns send the provider the same message
+# prefix and its prompt cache keeps hitting instead of missing on every turn
+# of a sliding window.
+_history_windows: TTLCache = TTLCache(maxsize=10_000, ttl=3600)
+
+# Compiled LangGraph agents keyed by the effective AI config. HRAgent is
+# built per request, but the graph depends only on the chat model and the
+# static tool schemas, so requests for the same config share one graph.
+_compiled_agents: TTLCache = TTLCache(maxsize=256, ttl=3600)
+
 # Canned responses for mock mode (no AI provider configured)
 _MOCK_RESPONSES = {
     "leave": "I'd be happy to help with your leave balance! In mock mode, I can't access real data. Please configure an AI provider for full functionality. Your mock leave balance: Annual: 15 remaining, Sick: 10 remaining.",
@@ -44,6 +81,15 @@ _MOCK_RESPONSES = {
     "default": "Hello! I'm your AI HR assistant. I can help with leave management, policy questions, and document generation. In mock mode, my responses are limited. Please configure an AI provider for full functionality.",
 }
 
+# One pass over the message; the group name is the _MOCK_RESPONSES key
+_MOCK_PATTERN = re.compile(
+    r"(?P<leave>leave|vacation|day off|pto|time off)"
+    r"|(?P<policy>policy|rule|guideline|handbook)"
+    r"|(?P<document>document|letter|certificate|generate)"
+    r"|(?P<resign>resign|quit|leaving)",
+    re.IGNORECASE,
+)
+
 
 def _normalize_ai_config(raw_config: dict) -> dict:
     """Convert API-stored ai_config field names to provider_factory field names.
@@ -78,12 +124,27 @@ def _normalize_ai_config(raw_config: dict) -> dict:
     return normalized
 
 
+def _event(data: dict[str, Any]) -> str:
+    """Encode one stream event as a JSON string."""
+    return orjson.dumps(data, default=str).decode()
+
+
+def _parse_tool_output(content: Any) -> Any:
+    """Decode a tool's JSON output; non-JSON output is kept as-is."""
+    try:
+        return orjson.loads(content)
+    except (orjson.JSONDecodeError, TypeError):
+        return content
+
+
 class HRAgent:
     """AI HR Agent using LangGraph with LangChain tool calling and mock fallback."""
 
     def __init__(self, ai_config: dict[str, Any] | None = None):
         self.conversation_manager = ConversationManager()
         self._llm = None
+        self._agent = None
+        self._response_cache: SemanticResponseCache | None = None
         self._ai_config = ai_config or {}
 
         # Try to create the LLM from the provided config
@@ -102,7 +163,8 @@ class HRAgent:
                 has_key = True  # Ollama doesn't need an API key
 
             if has_key:
-                self._llm = get_chat_model(effective_config)
+                self._llm, self._agent = self._compiled_agent(effective_config)
+                self._response_cache = get_response_cache(effective_config)
                 logger.info(
                     "HRAgent initialized with %s (model=%s)",
                     provider,
@@ -113,6 +175,16 @@ class HRAgent:
         except Exception as e:
             logger.warning("Failed to init LLM, using mock mode: %s", e)
 
+    @staticmethod
+    def _compiled_agent(ai_config: dict[str, Any]):
+        """Return (chat model, compiled agent) for ``ai_config``, building once."""
+        key = tuple(sorted(ai_config.items()))
+        cached = _compiled_agents.get(key)
+        if cached is None:
+            llm = get_chat_model(ai_config)
+            cached = _compiled_agents[key] = (llm, create_react_agent(llm, LANGCHAIN_TOOLS))
+        return cached
+
     @property
     def is_mock(self) -> bool:
         return self._llm is None
@@ -133,64 +205,70 @@ class HRAgent:
         Returns:
             Dict with keys: response (str), tool_calls (list|None), conversation_id (str)
         """
-        # Persist user message
-        await self.conversation_manager.add_message(
-            db, conversation_id, "user", user_message
-        )
-
         if self.is_mock:
             reply = self._mock_reply(user_message)
-            await self.conversation_manager.add_message(
-                db, conversation_id, "assistant", reply
-            )
+            await self._save_turn(db, conversation_id, user_message, reply)
             return {
                 "response": reply,
                 "tool_calls": None,
                 "conversation_id": str(conversation_id),
             }
 
-        # Build LangChain messages from conversation history
-        history = await self.conversation_manager.get_conversation_history(
-            db, conversation_id
-        )
-        lc_messages = self._build_messages(history, org_name)
+        # Build LangChain messages from conversation history; the new user
+        # message is persisted together with the reply at the end of the turn
+        history = await self._load_history(db, conversation_id)
 
-        # Create LangGraph agent with tools bound to this request's context
-        tools = get_langchain_tools(db, employee_id, organization_id)
-        from langgraph.prebuilt import create_react_agent
+        # An opening question the same employee asked recently reuses that reply
+        opening_turn = not history
+        cached, embedding = await self._cache_lookup(
+            organization_id, employee_id, user_message, opening_turn
+        )
+        if cached is not None:
+            await self._save_turn(db, conversation_id, user_message, cached.reply, cached.tool_calls)
+            return {
+                "response": cached.reply,
+                "tool_calls": cached.tool_calls,
+                "conversation_id": str(conversation_id),
+            }
 
-        agent = create_react_agent(self._llm, tools)
+        lc_messages = self._build_messages(history, org_name)
+        lc_messages.append(HumanMessage(content=user_message))
 
         # Invoke the agent — LangGraph handles the tool-calling loop automatically
-        result = await agent.ainvoke({"messages": lc_messages})
+        with bind_tool_context(db, employee_id, organization_id):
+            result = await self._agent.ainvoke({"messages": lc_messages})
 
-        # Extract the final response and any tool calls from the message history
+        # Extract the final response and any tool calls from the messages the
+        # agent added this turn; the replayed history is skipped
         reply = ""
         all_tool_calls: list[dict] = []
-        for msg in result["messages"]:
+        pending: dict[str, dict] = {}
+        for msg in result["messages"][len(lc_messages):]:
             if isinstance(msg, AIMessage):
                 if msg.tool_calls:
                     for tc in msg.tool_calls:
-                        all_tool_calls.append({
+                        entry = {
                             "tool": tc["name"],
                             "arguments": tc["args"],
                             "result": None,  # Will be filled from ToolMessage
-                        })
+                        }
+                        all_tool_calls.append(entry)
+                        if tc.get("id"):
+                            pending[tc["id"]] = entry
                 elif msg.content:
                     reply = msg.content
             elif isinstance(msg, ToolMessage):
-                # Match tool result to the last tool call without a result
-                for tc_entry in all_tool_calls:
-                    if tc_entry["result"] is None:
-                        try:
-                            tc_entry["result"] = json.loads(msg.content)
-                        except (json.JSONDecodeError, TypeError):
-                            tc_entry["result"] = msg.content
-                        break
+                entry = pending.pop(msg.tool_call_id, None)
+                if entry is None:
+                    # Provider sent no call ids; fall back to the first open call
+                    entry = next((e for e in all_tool_calls if e["result"] is None), None)
+                if entry is not None:
+                    entry["result"] = _parse_tool_output(msg.content)
 
         tc_data = all_tool_calls if all_tool_calls else None
-        await self.conversation_manager.add_message(
-            db, conversation_id, "assistant", reply, tool_calls=tc_data
+        await self._save_turn(db, conversation_id, user_message, reply, tc_data)
+        self._cache_store(
+            organization_id, employee_id, user_message, embedding, reply, tc_data, opening_turn
         )
         return {
             "response": reply,
@@ -216,83 +294,139 @@ class HRAgent:
           {"type": "done", "conversation_id": "..."}
           {"type": "error", "message": "..."}
         """
-        await self.conversation_manager.add_message(
-            db, conversation_id, "user", user_message
-        )
-
         if self.is_mock:
             reply = self._mock_reply(user_message)
-            await self.conversation_manager.add_message(
-                db, conversation_id, "assistant", reply
-            )
-            yield json.dumps({"type": "token", "content": reply})
-            yield json.dumps({"type": "done", "conversation_id": str(conversation_id)})
+            await self._save_turn(db, conversation_id, user_message, reply)
+            yield _event({"type": "token", "content": reply})
+            yield _event({"type": "done", "conversation_id": str(conversation_id)})
             return
 
-        history = await self.conversation_manager.get_conversation_history(
-            db, conversation_id
-        )
-        lc_messages = self._build_messages(history, org_name)
+        history = await self._load_history(db, conversation_id)
 
-        # Create LangGraph agent with tools bound to this request's context
-        tools = get_langchain_tools(db, employee_id, organization_id)
-        from langgraph.prebuilt import create_react_agent
+        opening_turn = not history
+        cached, embedding = await self._cache_lookup(
+            organization_id, employee_id, user_message, opening_turn
+        )
+        if cached is not None:
+            await self._save_turn(db, conversation_id, user_message, cached.reply, cached.tool_calls)
+            yield _event({"type": "token", "content": cached.reply})
+            yield _event({"type": "done", "conversation_id": str(conversation_id)})
+            return
 
-        agent = create_react_agent(self._llm, tools)
+        lc_messages = self._build_messages(history, org_name)
+        lc_messages.append(HumanMessage(content=user_message))
 
         # Stream events from the LangGraph agent
         all_tool_calls: list[dict] = []
-        final_reply = ""
-
-        async for event in agent.astream_events(
-            {"messages": lc_messages}, version="v2"
-        ):
-            kind = event["event"]
-
-            if kind == "on_chat_model_stream":
-                # Token-by-token streaming from the LLM
-                chunk = event["data"]["chunk"]
-                if hasattr(chunk, "content") and chunk.content and isinstance(chunk.content, str):
-                    final_reply += chunk.content
-                    yield json.dumps({"type": "token", "content": chunk.content})
-
-            elif kind == "on_tool_start":
-                tool_name = event.get("name", "unknown")
-                tool_input = event["data"].get("input", {})
-                yield json.dumps({"type": "tool_call", "tool": tool_name, "arguments": tool_input})
-
-            elif kind == "on_tool_end":
-                tool_name = event.get("name", "unknown")
-                raw_output = event["data"].get("output", "")
-                # Parse the tool output
-                try:
-                    if hasattr(raw_output, "content"):
-                        result_data = json.loads(raw_output.content)
-                    else:
-                        result_data = json.loads(str(raw_output))
-                except (json.JSONDecodeError, TypeError):
-                    result_data = str(raw_output)
-
-                all_tool_calls.append({
-                    "tool": tool_name,
-                    "arguments": event["data"].get("input", {}),
-                    "result": result_data,
-                })
-                yield json.dumps({"type": "tool_result", "tool": tool_name, "result": result_data})
+        reply_parts: list[str] = []
+
+        with bind_tool_context(db, employee_id, organization_id):
+            async for event in self._agent.astream_events(
+                {"messages": lc_messages}, version="v2"
+            ):
+                kind = event["event"]
+
+                if kind == "on_chat_model_stream":
+                    # Token-by-token streaming from the LLM
+                    chunk = event["data"]["chunk"]
+                    if hasattr(chunk, "content") and chunk.content and isinstance(chunk.content, str):
+                        reply_parts.append(chunk.content)
+                        yield _event({"type": "token", "content": chunk.content})
+
+                elif kind == "on_tool_start":
+                    tool_name = event.get("name", "unknown")
+                    tool_input = event["data"].get("input", {})
+                    yield _event({"type": "tool_call", "tool": tool_name, "arguments": tool_input})
+
+                elif kind == "on_tool_end":
+                    tool_name = event.get("name", "unknown")
+                    raw_output = event["data"].get("output", "")
+                    result_data = _parse_tool_output(
+                        raw_output.content if hasattr(raw_output, "content") else str(raw_output)
+                    )
+
+                    all_tool_calls.append({
+                        "tool": tool_name,
+                        "arguments": event["data"].get("input", {}),
+                        "result": result_data,
+                    })
+                    yield _event({"type": "tool_result", "tool": tool_name, "result": result_data})
 
         tc_data = all_tool_calls if all_tool_calls else None
-        await self.conversation_manager.add_message(
-            db, conversation_id, "assistant", final_reply, tool_calls=tc_data
+        final_reply = "".join(reply_parts)
+        await self._save_turn(db, conversation_id, user_message, final_reply, tc_data)
+        self._cache_store(
+            organization_id, employee_id, user_message, embedding, final_reply, tc_data, opening_turn
         )
-        yield json.dumps({"type": "done", "conversation_id": str(conversation_id)})
+        yield _event({"type": "done", "conversation_id": str(conversation_id)})
 
     # ── Private helpers ───────────────────────────────────────────────────────
 
+    async def _load_history(self, db: AsyncSession, conversation_id: UUID) -> list:
+        """Load the history window to replay, oldest first."""
+        history = await self.conversation_manager.get_conversation_history_rows(
+            db, conversation_id, limit=HISTORY_LIMIT, after=_history_windows.get(conversation_id)
+        )
+        if len(history) >= HISTORY_LIMIT:
+            dropped = history[HISTORY_LIMIT // 2 - 1]
+            _history_windows[conversation_id] = (dropped.created_at, dropped.id)
+            history = history[HISTORY_LIMIT // 2:]
+        return history
+
+    async def _cache_lookup(
+        self, organization_id: UUID, employee_id: UUID, user_message: str, opening_turn: bool
+    ):
+        """Return (cached reply or None, prompt embedding or None).
+
+        Only a conversation's opening turn is looked up; later prompts depend
+        on the history and always run the agent.
+        """
+        if self._response_cache is None or not opening_turn:
+            return None, None
+        return await self._response_cache.lookup(organization_id, employee_id, user_message)
+
+    def _cache_store(
+        self,
+        organization_id: UUID,
+        employee_id: UUID,
+        user_message: str,
+        embedding: tuple[float, ...] | None,
+        reply: str,
+        tool_calls: list[dict] | None,
+        opening_turn: bool,
+    ) -> None:
+        if self._response_cache is not None:
+            self._response_cache.store(
+                organization_id,
+                employee_id,
+                user_message,
+                embedding,
+                reply,
+                tool_calls,
+                opening_turn=opening_turn,
+            )
+
+    async def _save_turn(
+        self,
+        db: AsyncSession,
+        conversation_id: UUID,
+        user_message: str,
+        reply: str,
+        tool_calls: list[dict] | None = None,
+    ) -> None:
+        """Persist a user message and its reply in a single INSERT."""
+        await self.conversation_manager.add_messages(
+            db,
+            conversation_id,
+            [
+                {"role": "user", "content": user_message},
+                {"role": "assistant", "content": reply, "tool_calls": tool_calls},
+            ],
+        )
+
     def _build_messages(self, history: list, org_name: str) -> list:
         """Convert DB message history into LangChain message objects."""
-        messages = [
-            SystemMessage(content=SYSTEM_PROMPT_TEMPLATE.format(org_name=org_name))
-        ]
+        messages = [_STATIC_SYSTEM_MESSAGE, _org_context_message(org_name)]
         for msg in history:
             # Only include user and assistant text messages.
             # Stored tool_calls are in summary format (for frontend display)
@@ -308,13 +442,5 @@ class HRAgent:
     @staticmethod
     def _mock_reply(user_message: str) -> str:
         """Generate a canned response based on keyword matching."""
-        lower = user_message.lower()
-        if any(w in lower for w in ("leave", "vacation", "day off", "pto", "time off")):
-            return _MOCK_RESPONSES["leave"]
-        if any(w in lower for w in ("policy", "rule", "guideline", "handbook")):
-            return _MOCK_RESPONSES["policy"]
-        if any(w in lower for w in ("document", "letter", "certificate", "generate")):
-            return _MOCK_RESPONSES["document"]
-        if any(w in lower for w in ("resign", "quit", "leaving")):
-            return _MOCK_RESPONSES["resign"]
-        return _MOCK_RESPONSES["default"]
+        match = _MOCK_PATTERN.search(user_message)
+        return _MOCK_RESPONSES[match.lastgroup] if match else _MOCK_RESPONSES["default"]
@@ -12,6 +12,7 @@ from __future__ import annotations
 import logging
 from typing import Any
 
+import httpx
 from langchain_core.embeddings import Embeddings
 from langchain_core.language_models.chat_models import BaseChatModel
 
@@ -30,6 +31,38 @@ _DEFAULT_EMBEDDING_MODEL = "text-embedding-3-small"
 _DEFAULT_OLLAMA_BASE_URL = "http://localhost:11434"
 
 
+# ---------------------------------------------------------------------------
+# Shared HTTP client
+# ---------------------------------------------------------------------------
+
+_http_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the process-wide HTTP client used for LLM provider calls.
+
+    Chat models and embedding clients are built per request; sharing one
+    pooled client keeps connections (and their TLS sessions) alive between
+    requests.
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(60.0, connect=10.0),
+            limits=httpx.Limits(max_keepalive_connections=100, max_connections=200),
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client (called on application shutdown)."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
 def get_default_ai_config() -> dict[str, Any]:
     """Return a fallback AI config dict built from environment variables.
 
@@ -84,6 +117,7 @@ def get_chat_model(ai_config: dict[str, Any]) -> BaseChatModel:
             model=model,
             api_key=api_key,
             temperature=temperature,
+            http_async_client=get_http_client(),
         )
 
     if provider == "groq":
@@ -99,6 +133,7 @@ def get_chat_model(ai_config: dict[str, Any]) -> BaseChatModel:
             model=model,
             api_key=api_key,
             temperature=temperature,
+            http_async_client=get_http_client(),
         )
 
     if provider == "ollama":
@@ -147,7 +182,11 @@ def get_embeddings(ai_config: dict[str, Any]) -> Embeddings:
             )
         from langchain_openai import OpenAIEmbeddings
 
-        return OpenAIEmbeddings(model=model, api_key=api_key)
+        return OpenAIEmbeddings(
+            model=model,
+            api_key=api_key,
+            http_async_client=get_http_client(),
+        )
 
     if provider == "ollama":
         base_url = ai_config.get("ollama_base_url", _DEFAULT_OLLAMA_BASE_URL)
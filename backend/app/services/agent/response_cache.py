@@ -0,0 +1,224 @@
+"""Process-local semantic cache of agent replies.
+
+Employees ask the same handful of HR questions over and over, usually in
+slightly different words. The opening turn of a conversation whose
+embedding is close enough to one the same employee opened with recently
+reuses the stored reply instead of running the agent again. Entries are
+never shared across employees.
+
+Only opening turns are cached: later prompts ("yes", "and sick leave?")
+depend on the conversation so far and always go to the agent.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+from uuid import UUID
+
+from cachetools import TTLCache
+
+from app.services.agent.tools import READ_ONLY_TOOLS
+from app.services.rag.embeddings import EmbeddingService
+from app.services.rag.index_version import get_index_version
+
+logger = logging.getLogger(__name__)
+
+# Cosine similarity above which two prompts count as the same question
+SIMILARITY_THRESHOLD = 0.92
+
+# Normalized prompts shorter than this are never cached or looked up
+MIN_PROMPT_CHARS = 16
+
+# Seconds a cached reply stays valid
+CACHE_TTL = 3600
+
+# Recent turns kept per employee; the oldest is evicted first
+ENTRIES_PER_EMPLOYEE = 32
+
+
+@dataclass(frozen=True, slots=True)
+class CachedReply:
+    """A stored assistant turn."""
+
+    prompt: str
+    embedding: tuple[float, ...]
+    reply: str
+    tool_calls: Optional[list[dict]]
+    index_version: int
+    created_at: float
+
+
+# Buckets keyed by (org_id, employee_id); the bucket TTL is refreshed on
+# every store and each entry also carries its own timestamp. Entries from an
+# older policy index version are ignored, so policy edits orphan them.
+_buckets: TTLCache = TTLCache(maxsize=10_000, ttl=CACHE_TTL)
+
+# When each employee's replies were last invalidated, so a background store
+# that started before the invalidation does not re-add a stale reply
+_invalidated_at: TTLCache = TTLCache(maxsize=10_000, ttl=CACHE_TTL)
+
+# One cache per effective AI config, so its embedding client is built once
+_caches: TTLCache = TTLCache(maxsize=256, ttl=CACHE_TTL)
+
+# Background embed-and-store tasks, referenced until they finish
+_pending: set[asyncio.Task] = set()
+
+
+def get_response_cache(ai_config: dict[str, Any]) -> "SemanticResponseCache":
+    """Return the shared cache for ``ai_config``, building it on first use."""
+    key = tuple(sorted(ai_config.items()))
+    cache = _caches.get(key)
+    if cache is None:
+        cache = _caches[key] = SemanticResponseCache(ai_config)
+    return cache
+
+
+def invalidate_employee_replies(organization_id: UUID, employee_id: UUID) -> None:
+    """Drop an employee's cached replies after their HR data changes."""
+    key = (organization_id, employee_id)
+    _buckets.pop(key, None)
+    _invalidated_at[key] = time.monotonic()
+
+
+def _normalize(prompt: str) -> str:
+    return " ".join(prompt.lower().split())
+
+
+def _unit(vector: list[float]) -> tuple[float, ...]:
+    norm = math.sqrt(math.fsum(v * v for v in vector)) or 1.0
+    return tuple(v / norm for v in vector)
+
+
+def _cosine(a: tuple[float, ...], b: tuple[float, ...]) -> float:
+    # Both vectors are stored unit-length, so the dot product is the cosine
+    return math.fsum(x * y for x, y in zip(a, b))
+
+
+def _live_entries(organization_id: UUID, employee_id: UUID) -> list[CachedReply]:
+    cutoff = time.monotonic() - CACHE_TTL
+    version = get_index_version(organization_id)
+    return [
+        e
+        for e in _buckets.get((organization_id, employee_id), ())
+        if e.created_at > cutoff and e.index_version == version
+    ]
+
+
+class SemanticResponseCache:
+    """Look up and store opening-turn replies by prompt similarity, per employee."""
+
+    def __init__(self, ai_config: Optional[dict[str, Any]] = None):
+        self._embedder = EmbeddingService(ai_config)
+
+    @property
+    def enabled(self) -> bool:
+        # Mock embeddings are random and would never match
+        return not self._embedder.is_mock
+
+    async def lookup(
+        self, organization_id: UUID, employee_id: UUID, prompt: str
+    ) -> tuple[Optional[CachedReply], Optional[tuple[float, ...]]]:
+        """Return a cached reply for an opening ``prompt`` and its embedding.
+
+        The embedding is handed back so a miss can be stored without
+        embedding the prompt a second time. An employee with nothing cached
+        costs no embedding call here.
+        """
+        normalized = _normalize(prompt)
+        if not self.enabled or len(normalized) < MIN_PROMPT_CHARS:
+            return None, None
+
+        entries = _live_entries(organization_id, employee_id)
+        if not entries:
+            return None, None
+        for entry in entries:
+            if entry.prompt == normalized:
+                return entry, entry.embedding
+
+        try:
+            embedding = _unit(await self._embedder.embed_text(normalized))
+        except Exception as e:
+            logger.warning("Response cache embedding failed: %s", e)
+            return None, None
+
+        best, best_score = None, SIMILARITY_THRESHOLD
+        for entry in entries:
+            score = _cosine(embedding, entry.embedding)
+            if score > best_score:
+                best, best_score = entry, score
+        return best, embedding
+
+    def store(
+        self,
+        organization_id: UUID,
+        employee_id: UUID,
+        prompt: str,
+        embedding: Optional[tuple[float, ...]],
+        reply: str,
+        tool_calls: Optional[list[dict]] = None,
+        opening_turn: bool = True,
+    ) -> None:
+        """Cache a completed opening turn unless it changed state.
+
+        Called for every turn: one that ran a mutating tool drops the
+        employee's entries even when it is not itself cacheable. Without an
+        embedding from ``lookup`` the prompt is embedded in a background
+        task, off the response path.
+        """
+        # A turn that called anything but a read-only tool is not cached
+        if tool_calls and any(tc["tool"] not in READ_ONLY_TOOLS for tc in tool_calls):
+            # Cached leave balances etc. would now be stale
+            invalidate_employee_replies(organization_id, employee_id)
+            return
+        normalized = _normalize(prompt)
+        if not (opening_turn and self.enabled and reply) or len(normalized) < MIN_PROMPT_CHARS:
+            return
+
+        entry = CachedReply(
+            prompt=normalized,
+            embedding=embedding or (),
+            reply=reply,
+            tool_calls=tool_calls,
+            index_version=get_index_version(organization_id),
+            created_at=time.monotonic(),
+        )
+        if embedding is not None:
+            self._append(organization_id, employee_id, entry)
+            return
+        task = asyncio.create_task(self._embed_and_append(organization_id, employee_id, entry))
+        _pending.add(task)
+        task.add_done_callback(_pending.discard)
+
+    async def _embed_and_append(
+        self, organization_id: UUID, employee_id: UUID, entry: CachedReply
+    ) -> None:
+        try:
+            embedding = _unit(await self._embedder.embed_text(entry.prompt))
+        except Exception as e:
+            logger.warning("Response cache embedding failed: %s", e)
+            return
+        version = get_index_version(organization_id)
+        if version == entry.index_version:
+            self._append(
+                organization_id,
+                employee_id,
+                CachedReply(
+                    prompt=entry.prompt,
+                    embedding=embedding,
+                    reply=entry.reply,
+                    tool_calls=entry.tool_calls,
+                    index_version=version,
+                    created_at=entry.created_at,
+                ),
+            )
+
+    @staticmethod
+    def _append(organization_id: UUID, employee_id: UUID, entry: CachedReply) -> None:
+        if entry.created_at <= _invalidated_at.get((organization_id, employee_id), 0.0):
+            return
+        entries = _live_entries(organization_id, employee_id)
+        entries.append(entry)
+        _buckets[(organization_id, employee_id)] = entries[-ENTRIES_PER_EMPLOYEE:]
@@ -2,20 +2,26 @@
 
 Each tool maps to an existing HR service or RAG pipeline operation.
 Tools are available in two formats:
-  - LangChain @tool functions via get_langchain_tools()
+  - LangChain @tool functions in LANGCHAIN_TOOLS, run inside bind_tool_context()
   - Legacy OpenAI format via TOOL_DEFINITIONS + execute_tool() (backward compat)
 """
 
-import json
+import asyncio
 import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from datetime import date
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
 from uuid import UUID
 
+import orjson
 from langchain_core.tools import tool
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
+from app.core.database import async_session_factory
 from app.models.document import Document
 from app.models.employee import Employee
 from app.models.leave_balance import LeaveBalance
@@ -123,6 +129,11 @@ TOOL_DEFINITIONS: list[dict[str, Any]] = [
 _rag_pipeline = RAGPipeline()
 
 
+def _dumps(result: dict) -> str:
+    # UUIDs and dates serialize natively; default=str covers Decimal and the rest
+    return orjson.dumps(result, default=str).decode()
+
+
 async def execute_tool(
     tool_name: str,
     arguments: dict[str, Any],
@@ -145,12 +156,12 @@ async def execute_tool(
     try:
         handler = _TOOL_HANDLERS.get(tool_name)
         if handler is None:
-            return json.dumps({"error": f"Unknown tool: {tool_name}"})
+            return _dumps({"error": f"Unknown tool: {tool_name}"})
         result = await handler(arguments, db, employee_id, organization_id)
-        return json.dumps(result, default=str)
+        return _dumps(result)
     except Exception as e:
         logger.exception("Tool execution error for %s", tool_name)
-        return json.dumps({"error": str(e)})
+        return _dumps({"error": str(e)})
 
 
 async def _check_leave_balance(
@@ -307,116 +318,153 @@ _TOOL_HANDLERS = {
 }
 
 
-# ── LangChain tool factory ──────────────────────────────────────────────────
+# ── LangChain tools ─────────────────────────────────────────────────────────
 
 
-def get_langchain_tools(
-    db: AsyncSession,
-    employee_id: UUID,
-    organization_id: UUID,
-) -> list:
-    """Create LangChain tools with injected DB session and tenant context.
+@dataclass(frozen=True, slots=True)
+class ToolContext:
+    """Per-turn values the tools need but the LLM never sees."""
+
+    db: AsyncSession
+    employee_id: UUID
+    organization_id: UUID
+    # Serializes tool calls on ``db``; an AsyncSession must not be used concurrently
+    db_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+# Tools that only read data. LangGraph runs the calls of one round
+# concurrently, so these get their own pooled session instead of queueing on
+# the turn's session; their reads do not see the turn's uncommitted writes.
+READ_ONLY_TOOLS = frozenset({
+    "check_leave_balance",
+    "get_employee_info",
+    "search_policies",
+    "get_policy_details",
+})
+
+# Extra connections tool calls may hold at once, on top of the one each turn
+# already holds. Kept below DB_MAX_OVERFLOW so concurrent multi-tool turns
+# cannot drain the pool and time out waiting on each other; when none is
+# free a call runs on the turn's session instead. Size DB_POOL_SIZE plus
+# DB_MAX_OVERFLOW for concurrent turns plus this headroom.
+_tool_sessions = asyncio.Semaphore(max(1, settings.DB_MAX_OVERFLOW // 2))
+
+_tool_context: ContextVar[ToolContext] = ContextVar("agent_tool_context")
+
+
+@contextmanager
+def bind_tool_context(
+    db: AsyncSession, employee_id: UUID, organization_id: UUID
+) -> Iterator[None]:
+    """Bind the DB session and tenant context for tools run inside the block.
 
-    Each returned tool is a LangChain ``BaseTool`` instance that the LangGraph
-    agent can invoke directly.  The ``db``, ``employee_id``, and
-    ``organization_id`` values are captured via closure so the LLM never sees
-    them as parameters.
+    The tool objects themselves are module-level, so a compiled agent graph
+    can be reused across requests; each turn only rebinds this context.
     """
+    token = _tool_context.set(ToolContext(db, employee_id, organization_id))
+    try:
+        yield
+    finally:
+        _tool_context.reset(token)
+
+
+async def _run(name: str, args: dict) -> str:
+    ctx = _tool_context.get()
+    handler = _TOOL_HANDLERS[name]
+    # locked() and the acquire below run without yielding, so no race
+    if name in READ_ONLY_TOOLS and not _tool_sessions.locked():
+        async with _tool_sessions, async_session_factory() as db:
+            result = await handler(args, db, ctx.employee_id, ctx.organization_id)
+    else:
+        async with ctx.db_lock:
+            result = await handler(args, ctx.db, ctx.employee_id, ctx.organization_id)
+    return _dumps(result)
+
+
+@tool
+async def check_leave_balance(
+    leave_type: Optional[str] = None,
+) -> str:
+    """Check an employee's leave balance. Returns remaining days for each leave type.
 
-    @tool
-    async def check_leave_balance(
-        leave_type: Optional[str] = None,
-    ) -> str:
-        """Check an employee's leave balance. Returns remaining days for each leave type.
-
-        Args:
-            leave_type: Optional leave type filter (annual, sick, maternity, paternity, unpaid). If omitted, returns all types.
-        """
-        result = await _check_leave_balance(
-            {"leave_type": leave_type} if leave_type else {},
-            db, employee_id, organization_id,
-        )
-        return json.dumps(result, default=str)
-
-    @tool
-    async def submit_leave_request(
-        leave_type: str,
-        start_date: str,
-        end_date: str,
-        reason: Optional[str] = None,
-    ) -> str:
-        """Submit a leave request on behalf of the employee.
-
-        Args:
-            leave_type: Type of leave (annual, sick, maternity, paternity, unpaid).
-            start_date: Start date in YYYY-MM-DD format.
-            end_date: End date in YYYY-MM-DD format.
-            reason: Reason for the leave request.
-        """
-        result = await _submit_leave_request(
-            {
-                "leave_type": leave_type,
-                "start_date": start_date,
-                "end_date": end_date,
-                "reason": reason,
-            },
-            db, employee_id, organization_id,
-        )
-        return json.dumps(result, default=str)
+    Args:
+        leave_type: Optional leave type filter (annual, sick, maternity, paternity, unpaid). If omitted, returns all types.
+    """
+    return await _run("check_leave_balance", {"leave_type": leave_type} if leave_type else {})
 
-    @tool
-    async def get_employee_info() -> str:
-        """Get the current employee's profile information (name, department, position, hire date, etc.)."""
-        result = await _get_employee_info(
-            {}, db, employee_id, organization_id,
-        )
-        return json.dumps(result, default=str)
 
-    @tool
-    async def search_policies(query: str) -> str:
-        """Search the organization's HR policy documents using semantic search.
+@tool
+async def submit_leave_request(
+    leave_type: str,
+    start_date: str,
+    end_date: str,
+    reason: Optional[str] = None,
+) -> str:
+    """Submit a leave request on behalf of the employee.
 
-        Use this to answer questions about company policies, benefits, rules, and procedures.
+    Args:
+        leave_type: Type of leave (annual, sick, maternity, paternity, unpaid).
+        start_date: Start date in YYYY-MM-DD format.
+        end_date: End date in YYYY-MM-DD format.
+        reason: Reason for the leave request.
+    """
+    return await _run(
+        "submit_leave_request",
+        {
+            "leave_type": leave_type,
+            "start_date": start_date,
+            "end_date": end_date,
+            "reason": reason,
+        },
+    )
 
-        Args:
-            query: The search query describing what policy information is needed.
-        """
-        result = await _search_policies(
-            {"query": query}, db, employee_id, organization_id,
-        )
-        return json.dumps(result, default=str)
 
-    @tool
-    async def generate_document(document_type: str) -> str:
-        """Generate an HR document for the employee.
+@tool
+async def get_employee_info() -> str:
+    """Get the current employee's profile information (name, department, position, hire date, etc.)."""
+    return await _run("get_employee_info", {})
 
-        Supported types: contract, resignation_letter, experience_letter, salary_certificate, noc.
 
-        Args:
-            document_type: Type of document to generate.
-        """
-        result = await _generate_document(
-            {"document_type": document_type}, db, employee_id, organization_id,
-        )
-        return json.dumps(result, default=str)
+@tool
+async def search_policies(query: str) -> str:
+    """Search the organization's HR policy documents using semantic search.
 
-    @tool
-    async def get_policy_details(policy_id: str) -> str:
-        """Get the full text of a specific policy document by its ID.
+    Use this to answer questions about company policies, benefits, rules, and procedures.
 
-        Args:
-            policy_id: The UUID of the policy document.
-        """
-        result = await _get_policy_details(
-            {"policy_id": policy_id}, db, employee_id, organization_id,
-        )
-        return json.dumps(result, default=str)
-
-    return [
-        check_leave_balance,
-        submit_leave_request,
-        get_employee_info,
-        search_policies,
-        generate_document,
-        get_policy_details,
-    ]
+    Args:
+        query: The search query describing what policy information is needed.
+    """
+    return await _run("search_policies", {"query": query})
+
+
+@tool
+async def generate_document(document_type: str) -> str:
+    """Generate an HR document for the employee.
+
+    Supported types: contract, resignation_letter, experience_letter, salary_certificate, noc.
+
+    Args:
+        document_type: Type of document to generate.
+    """
+    return await _run("generate_document", {"document_type": document_type})
+
+
+@tool
+async def get_policy_details(policy_id: str) -> str:
+    """Get the full text of a specific policy document by its ID.
+
+    Args:
+        policy_id: The UUID of the policy document.
+    """
+    return await _run("get_policy_details", {"policy_id": policy_id})
+
+
+# Passed to the LangGraph agent; call inside ``bind_tool_context``
+LANGCHAIN_TOOLS = [
+    check_leave_balance,
+    submit_leave_request,
+    get_employee_info,
+    search_policies,
+    generate_document,
+    get_policy_details,
+]
@@ -10,7 +10,7 @@ import logging
 from typing import Any
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.alert_config import AlertConfig
@@ -24,6 +24,10 @@ from app.services.alerts.triggers import (
 logger = logging.getLogger(__name__)
 
 
+class EmployeeNotFoundError(ValueError):
+    """Raised when a trigger event references an employee outside the org."""
+
+
 async def _send_message(
     employee: Employee,
     message: str,
@@ -78,48 +82,139 @@ async def _compose_proactive_message(
         return template
 
 
-async def process_trigger_event(
+async def _load_trigger_targets(
     db: AsyncSession,
     trigger_event: TriggerEvent,
-) -> AlertEvent | None:
-    """Process a single trigger event.
+) -> tuple[Employee, list[AlertConfig]]:
+    """Load the employee and the active configs matching a trigger event.
 
-    1. Find matching active AlertConfig(s) for the org + trigger_type
-    2. Create an AlertEvent record for each match
-    3. Compose and send a proactive message
+    Raises:
+        EmployeeNotFoundError: If the employee does not belong to the org.
     """
-    # Find matching alert configs
+    # Verify org membership and find matching alert configs in one query
     result = await db.execute(
-        select(AlertConfig).where(
-            AlertConfig.organization_id == trigger_event.organization_id,
-            AlertConfig.trigger_type == trigger_event.trigger_type,
-            AlertConfig.is_active.is_(True),
+        select(Employee, AlertConfig)
+        .outerjoin(
+            AlertConfig,
+            and_(
+                AlertConfig.organization_id == Employee.organization_id,
+                AlertConfig.trigger_type == trigger_event.trigger_type,
+                AlertConfig.is_active.is_(True),
+            ),
+        )
+        .where(
+            Employee.id == trigger_event.employee_id,
+            Employee.organization_id == trigger_event.organization_id,
         )
     )
-    configs = list(result.scalars().all())
+    rows = result.all()
+    if not rows:
+        raise EmployeeNotFoundError(
+            f"Employee {trigger_event.employee_id} not found in org "
+            f"{trigger_event.organization_id}"
+        )
 
+    employee = rows[0][0]
+    configs = [config for _, config in rows if config is not None]
     if not configs:
         logger.debug(
             "No active alert config for org=%s trigger_type=%s",
             trigger_event.organization_id,
             trigger_event.trigger_type,
         )
-        return None
+    return employee, configs
 
-    # Fetch the employee
-    emp_result = await db.execute(
-        select(Employee).where(
-            Employee.id == trigger_event.employee_id,
-            Employee.organization_id == trigger_event.organization_id,
-        )
+
+async def _deliver_alert(
+    alert_event: AlertEvent,
+    config: AlertConfig,
+    employee: Employee,
+) -> None:
+    """Compose and send the proactive message for a recorded alert event."""
+    message = await _compose_proactive_message(
+        config.action_template, employee, alert_event.context or {}
     )
-    employee = emp_result.scalar_one_or_none()
-    if not employee:
-        logger.warning(
-            "Employee %s not found in org %s",
-            trigger_event.employee_id,
-            trigger_event.organization_id,
+    await _send_message(employee, message)
+
+    # Update status to in_progress
+    alert_event.status = "in_progress"
+
+    logger.info(
+        "Processed alert event %s for config '%s' → employee %s",
+        alert_event.id,
+        config.name,
+        employee.full_name,
+    )
+
+
+async def record_trigger_event(
+    db: AsyncSession,
+    trigger_event: TriggerEvent,
+) -> list[AlertEvent]:
+    """Record an AlertEvent for every active config matching the trigger.
+
+    Messages are not sent; pass the event ids to ``dispatch_alert_events``.
+    Returns an empty list when no active config matches.
+
+    Raises:
+        EmployeeNotFoundError: If the employee does not belong to the org.
+    """
+    _, configs = await _load_trigger_targets(db, trigger_event)
+    events = [
+        AlertEvent(
+            alert_config_id=config.id,
+            organization_id=trigger_event.organization_id,
+            employee_id=trigger_event.employee_id,
+            status="triggered",
+            context=trigger_event.context,
         )
+        for config in configs
+    ]
+    if events:
+        db.add_all(events)
+        await db.flush()
+    return events
+
+
+async def dispatch_alert_events(event_ids: list[UUID]) -> None:
+    """Compose and send messages for previously recorded alert events.
+
+    Runs outside the request (e.g. as a background task), so it opens its
+    own session.
+    """
+    from app.core.database import async_session_factory
+
+    async with async_session_factory() as db:
+        try:
+            result = await db.execute(
+                select(AlertEvent, AlertConfig, Employee)
+                .join(AlertConfig, AlertConfig.id == AlertEvent.alert_config_id)
+                .join(Employee, Employee.id == AlertEvent.employee_id)
+                .where(AlertEvent.id.in_(event_ids))
+            )
+            for alert_event, config, employee in result.all():
+                await _deliver_alert(alert_event, config, employee)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            logger.exception("Failed to dispatch alert events %s", event_ids)
+
+
+async def process_trigger_event(
+    db: AsyncSession,
+    trigger_event: TriggerEvent,
+) -> AlertEvent | None:
+    """Process a single trigger event.
+
+    1. Find matching active AlertConfig(s) for the org + trigger_type
+    2. Create an AlertEvent record for each match
+    3. Compose and send a proactive message
+
+    Raises:
+        EmployeeNotFoundError: If the employee does not belong to the org.
+    """
+    employee, configs = await _load_trigger_targets(db, trigger_event)
+    if not configs:
         return None
 
     last_event: AlertEvent | None = None
@@ -135,22 +230,8 @@ async def process_trigger_event(
         db.add(alert_event)
         await db.flush()
 
-        # Compose and send message
-        message = await _compose_proactive_message(
-            config.action_template, employee, trigger_event.context
-        )
-        await _send_message(employee, message)
-
-        # Update status to in_progress
-        alert_event.status = "in_progress"
+        await _deliver_alert(alert_event, config, employee)
         await db.flush()
-
-        logger.info(
-            "Processed alert event %s for config '%s' → employee %s",
-            alert_event.id,
-            config.name,
-            employee.full_name,
-        )
         last_event = alert_event
 
     return last_event
@@ -185,7 +266,11 @@ async def run_scheduled_triggers(db: AsyncSession) -> int:
             trigger = trigger_cls(trigger_config=config.trigger_config)
             events = await trigger.evaluate(db, org.id)
             for event in events:
-                alert_event = await process_trigger_event(db, event)
+                try:
+                    alert_event = await process_trigger_event(db, event)
+                except EmployeeNotFoundError as exc:
+                    logger.warning("%s", exc)
+                    continue
                 if alert_event:
                     total_events += 1
 
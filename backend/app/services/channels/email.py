@@ -11,8 +11,9 @@ import hmac
 import logging
 import smtplib
 from email.mime.multipart import MIMEMultipart
+from email.parser import HeaderParser
 from email.mime.text import MIMEText
-from typing import Optional
+from typing import Any, Mapping, Optional
 
 import httpx
 
@@ -20,12 +21,23 @@ from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+_HEADER_PARSER = HeaderParser()
+
 
 class EmailService:
     """Send and receive emails via SMTP or SendGrid."""
 
     SENDGRID_API_BASE = "https://api.sendgrid.com/v3"
 
+    def __init__(self):
+        # Keyed HMAC state, copied per request instead of re-keyed
+        secret = settings.EMAIL_WEBHOOK_SECRET
+        self._webhook_hmac = (
+            hmac.new(secret.encode("utf-8"), digestmod=hashlib.sha256)
+            if secret
+            else None
+        )
+
     @property
     def is_configured(self) -> bool:
         """True if at least one email provider is configured."""
@@ -122,34 +134,50 @@ class EmailService:
             logger.exception("Failed to send email via SMTP: %s", e)
             return False
 
-    @staticmethod
-    def verify_webhook_signature(payload: bytes, signature: str) -> bool:
+    def verify_webhook_signature(self, payload: bytes, signature: str) -> bool:
         """Verify SendGrid Inbound Parse webhook signature."""
-        secret = settings.EMAIL_WEBHOOK_SECRET
-        if not secret:
+        if self._webhook_hmac is None:
             logger.warning("No EMAIL_WEBHOOK_SECRET — skipping verification")
             return True  # Allow in dev mode
 
-        computed = hmac.new(
-            secret.encode("utf-8"), payload, hashlib.sha256
-        ).hexdigest()
-        return hmac.compare_digest(computed, signature)
+        mac = self._webhook_hmac.copy()
+        mac.update(payload)
+        return hmac.compare_digest(mac.hexdigest(), signature)
 
     @staticmethod
-    def parse_inbound(form_data: dict) -> dict:
+    def parse_inbound(form_data: Mapping[str, Any]) -> dict:
         """Parse a SendGrid Inbound Parse webhook payload.
 
         Returns a normalized dict with sender, subject, body, etc.
         """
+        sender = form_data.get("from", "")
+        subject = form_data.get("subject", "")
+        body = form_data.get("text", "") or form_data.get("html", "")
         return {
-            "sender": form_data.get("from", ""),
+            "sender": sender,
             "to": form_data.get("to", ""),
-            "subject": form_data.get("subject", ""),
-            "body": form_data.get("text", "") or form_data.get("html", ""),
-            "message_id": form_data.get("Message-Id", ""),
+            "subject": subject,
+            "body": body,
+            "message_id": _message_id(form_data.get("headers", ""), sender, subject, body),
         }
 
 
+def _message_id(raw_headers: str, sender: str, subject: str, body: str) -> str:
+    """The email's Message-ID, or a digest of its content when it has none.
+
+    Inbound Parse posts the original headers as one raw ``headers`` field
+    rather than as separate form fields.
+    """
+    message_id = _HEADER_PARSER.parsestr(raw_headers or "").get("Message-ID", "").strip()
+    if message_id:
+        return message_id
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (sender, subject, body):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return f"digest:{digest.hexdigest()}"
+
+
 # Module-level singleton
 email_service = EmailService()
 
@@ -25,8 +25,11 @@ logger = logging.getLogger(__name__)
 _conversation_manager = ConversationManager()
 
 
-async def _create_agent(db: AsyncSession, org_id: UUID) -> HRAgent:
-    """Create an HRAgent per-request using the org's AI config."""
+async def _create_agent(db: AsyncSession, org_id: UUID) -> tuple[HRAgent, str]:
+    """Create an HRAgent per-request using the org's AI config.
+
+    Also returns the org name, read from the same row.
+    """
     result = await db.execute(
         select(Organization).where(Organization.id == org_id)
     )
@@ -37,7 +40,7 @@ async def _create_agent(db: AsyncSession, org_id: UUID) -> HRAgent:
         raw_config = {}
 
     ai_config = _normalize_ai_config(raw_config) if raw_config else get_default_ai_config()
-    return HRAgent(ai_config=ai_config)
+    return HRAgent(ai_config=ai_config), org.name if org else "Your Organization"
 
 
 async def _lookup_employee_by_phone(
@@ -67,14 +70,6 @@ async def _lookup_employee_by_email(
     return result.scalar_one_or_none()
 
 
-async def _get_org_name(db: AsyncSession, org_id: UUID) -> str:
-    result = await db.execute(
-        select(Organization.name).where(Organization.id == org_id)
-    )
-    name = result.scalar_one_or_none()
-    return name or "Your Organization"
-
-
 async def _get_or_create_conversation(
     db: AsyncSession,
     organization_id: UUID,
@@ -119,9 +114,7 @@ async def handle_whatsapp_message(
     conv = await _get_or_create_conversation(
         db, employee.organization_id, employee.id, channel="whatsapp"
     )
-    org_name = await _get_org_name(db, employee.organization_id)
-
-    agent = await _create_agent(db, employee.organization_id)
+    agent, org_name = await _create_agent(db, employee.organization_id)
     result = await agent.chat(
         db=db,
         conversation_id=conv.id,
@@ -156,12 +149,11 @@ async def handle_email_message(
     conv = await _get_or_create_conversation(
         db, employee.organization_id, employee.id, channel="email"
     )
-    org_name = await _get_org_name(db, employee.organization_id)
 
     # Use subject + body as the message content
     full_message = f"[Subject: {subject}]\n{body}" if subject else body
 
-    agent = await _create_agent(db, employee.organization_id)
+    agent, org_name = await _create_agent(db, employee.organization_id)
     result = await agent.chat(
         db=db,
         conversation_id=conv.id,
@@ -10,7 +10,7 @@ import hashlib
 import hmac
 import logging
 from base64 import b64encode
-from typing import Optional
+from typing import Mapping, Optional
 from urllib.parse import urlencode
 
 import httpx
@@ -29,6 +29,12 @@ class WhatsAppService:
         self._account_sid = settings.TWILIO_ACCOUNT_SID
         self._auth_token = settings.TWILIO_AUTH_TOKEN
         self._from_number = settings.TWILIO_WHATSAPP_FROM
+        # Keyed HMAC state, copied per request instead of re-keyed
+        self._hmac_template = (
+            hmac.new(self._auth_token.encode("utf-8"), digestmod=hashlib.sha1)
+            if self._auth_token
+            else None
+        )
 
     @property
     def is_configured(self) -> bool:
@@ -81,34 +87,30 @@ class WhatsAppService:
                 logger.exception("Failed to send WhatsApp message: %s", e)
                 return None
 
-    def verify_signature(self, url: str, params: dict, signature: str) -> bool:
+    def verify_signature(
+        self, url: str, params: Mapping[str, str], signature: str
+    ) -> bool:
         """Verify Twilio webhook request signature.
 
         Twilio signs requests using HMAC-SHA1 of the full URL + sorted POST params.
         See: https://www.twilio.com/docs/usage/security#validating-requests
         """
-        if not self._auth_token:
+        if self._hmac_template is None:
             logger.warning("No auth token configured — cannot verify signature")
             return False
 
-        # Build the data string: URL + sorted param key-value pairs
-        data = url
+        # HMAC-SHA1 over the URL followed by the sorted param key-value pairs
+        mac = self._hmac_template.copy()
+        mac.update(url.encode("utf-8"))
         for key in sorted(params.keys()):
-            data += key + params[key]
-
-        # Compute HMAC-SHA1
-        computed = b64encode(
-            hmac.new(
-                self._auth_token.encode("utf-8"),
-                data.encode("utf-8"),
-                hashlib.sha1,
-            ).digest()
-        ).decode()
+            mac.update(key.encode("utf-8"))
+            mac.update(params[key].encode("utf-8"))
 
+        computed = b64encode(mac.digest()).decode()
         return hmac.compare_digest(computed, signature)
 
     @staticmethod
-    def parse_inbound(form_data: dict) -> dict:
+    def parse_inbound(form_data: Mapping[str, str]) -> dict:
         """Parse an inbound Twilio WhatsApp webhook payload.
 
         Returns a normalized dict with sender, body, and metadata.
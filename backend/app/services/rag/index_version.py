@@ -0,0 +1,20 @@
+"""Per-organization policy index versions.
+
+Cached RAG query results are keyed by the org's current version; anything
+that changes which policy text can be retrieved bumps it, orphaning the
+org's old entries.
+"""
+
+from uuid import UUID
+
+_index_versions: dict[UUID, int] = {}
+
+
+def get_index_version(org_id: UUID) -> int:
+    """The org's current index version (0 until first bumped)."""
+    return _index_versions.get(org_id, 0)
+
+
+def bump_index_version(org_id: UUID) -> None:
+    """Invalidate cached query results for an org after its policies change."""
+    _index_versions[org_id] = _index_versions.get(org_id, 0) + 1
@@ -3,21 +3,94 @@
 Orchestrates the chunker, embedding service, and vector retriever.
 """
 
+import csv
+import io
 import logging
 from typing import Any, Optional
 from uuid import UUID
 
+import orjson
 from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.database import uuid7
 from app.models.policy_chunk import PolicyChunk
 from app.models.policy_document import PolicyDocument
 from app.services.rag.chunker import DocumentChunker
 from app.services.rag.embeddings import EmbeddingService
-from app.services.rag.retriever import RetrievedChunk, VectorRetriever
+from app.services.rag.retriever import (
+    RetrievedChunk,
+    VectorRetriever,
+    halfvec_literal,
+)
 
 logger = logging.getLogger(__name__)
 
+# Target columns for COPY, in CSV field order
+_CHUNK_COPY_COLUMNS = [
+    "id",
+    "policy_document_id",
+    "organization_id",
+    "chunk_text",
+    "chunk_index",
+    "embedding",
+    "metadata",
+]
+
+
+def _chunk_csv(rows: list[dict[str, Any]]) -> bytes:
+    """Encode chunk rows as CSV for COPY; ``None`` becomes an empty (NULL) field."""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for row in rows:
+        embedding = row["embedding"]
+        if embedding is not None:
+            embedding = halfvec_literal(embedding)
+        metadata = row["metadata_"]
+        if metadata is not None:
+            metadata = orjson.dumps(metadata).decode()
+        writer.writerow(
+            [
+                str(uuid7()),
+                str(row["policy_document_id"]),
+                str(row["organization_id"]),
+                row["chunk_text"],
+                row["chunk_index"],
+                embedding,
+                metadata,
+            ]
+        )
+    return buf.getvalue().encode()
+
+
+async def bulk_insert_chunks(
+    db: AsyncSession, rows: list[dict[str, Any]]
+) -> None:
+    """Load policy chunks with a single COPY on the session's connection.
+
+    COPY streams every row in one round trip, inside the session's current
+    transaction. COPY bypasses the ORM, so ids are generated here; created_at
+    comes from the column's server default.
+
+    Args:
+        db: Async database session.
+        rows: PolicyChunk attribute dicts (``policy_document_id``,
+              ``organization_id``, ``chunk_text``, ``chunk_index``,
+              ``embedding``, ``metadata_``).
+    """
+    if not rows:
+        return
+    conn = await db.connection()
+    raw = await conn.get_raw_connection()
+    await raw.driver_connection.copy_to_table(
+        PolicyChunk.__tablename__,
+        source=io.BytesIO(_chunk_csv(rows)),
+        columns=_CHUNK_COPY_COLUMNS,
+        format="csv",
+        # An empty chunk_text is an empty string, not NULL
+        force_not_null=["chunk_text"],
+    )
+
 
 class RAGPipeline:
     """High-level RAG operations: ingest, query, re-index."""
@@ -27,6 +100,19 @@ class RAGPipeline:
         self.chunker = DocumentChunker()
         self.retriever = VectorRetriever()
 
+    async def warmup(self) -> None:
+        """Open the embedding provider connection ahead of the first request.
+
+        Failures are logged, not raised — the provider may be briefly
+        unreachable at boot and requests will retry on their own.
+        """
+        if self.embedding_service.is_mock:
+            return
+        try:
+            await self.embedding_service.embed_text("warmup")
+        except Exception as e:
+            logger.warning("RAG pipeline warmup failed: %s", e)
+
     async def ingest(
         self,
         db: AsyncSession,
@@ -85,18 +171,20 @@ class RAGPipeline:
         embeddings = await self.embedding_service.embed_texts(texts)
 
         # Store chunks with embeddings
-        for chunk, embedding in zip(chunks, embeddings):
-            db_chunk = PolicyChunk(
-                policy_document_id=chunk.policy_document_id,
-                organization_id=chunk.organization_id,
-                chunk_text=chunk.text,
-                chunk_index=chunk.index,
-                embedding=embedding,
-                metadata_=chunk.metadata,
-            )
-            db.add(db_chunk)
-
-        await db.flush()
+        await bulk_insert_chunks(
+            db,
+            [
+                {
+                    "policy_document_id": chunk.policy_document_id,
+                    "organization_id": chunk.organization_id,
+                    "chunk_text": chunk.text,
+                    "chunk_index": chunk.index,
+                    "embedding": embedding,
+                    "metadata_": chunk.metadata,
+                }
+                for chunk, embedding in zip(chunks, embeddings)
+            ],
+        )
 
         logger.info(
             "Ingested policy %s: %d chunks created", policy_id, len(chunks)
@@ -15,6 +15,19 @@ logger = logging.getLogger(__name__)
 
 DEFAULT_TOP_K = 5
 
+# HNSW candidate list size; higher improves recall at the cost of latency
+HNSW_EF_SEARCH = 100
+
+
+def halfvec_literal(embedding: list[float]) -> str:
+    """Format an embedding as a pgvector literal for a halfvec column.
+
+    FP16 keeps 11 significant bits, so five significant digits round-trip
+    exactly; ``str(float)`` would send ~18 digits per dimension that the
+    server immediately rounds away.
+    """
+    return "[" + ",".join([format(v, ".5g") for v in embedding]) + "]"
+
 
 @dataclass
 class RetrievedChunk:
@@ -54,26 +67,52 @@ class VectorRetriever:
         """
         k = top_k or self.top_k
 
+        # Scoped to the current transaction. Iterative scans keep walking the
+        # HNSW graph until enough rows survive the tenant filter, instead of
+        # returning fewer than k results for small organizations.
+        # hnsw.iterative_scan requires pgvector >= 0.8.
+        await db.execute(
+            text(
+                "SELECT set_config('hnsw.ef_search', :ef_search, true), "
+                "set_config('hnsw.iterative_scan', 'relaxed_order', true)"
+            ),
+            {"ef_search": str(HNSW_EF_SEARCH)},
+        )
+
         # Use pgvector's cosine distance operator (<=>)
-        # Cosine distance = 1 - cosine_similarity, so we convert back
+        # Cosine distance = 1 - cosine_similarity, so we convert back.
+        # The query vector is cast to halfvec so the HNSW index is usable.
+        # relaxed_order may return neighbours slightly out of order, so the
+        # materialized result is re-sorted by exact distance.
         query = text(
             """
+            WITH nearest AS MATERIALIZED (
+                SELECT
+                    id,
+                    policy_document_id,
+                    chunk_text,
+                    chunk_index,
+                    metadata,
+                    embedding <=> CAST(:embedding AS halfvec(1536)) AS distance
+                FROM policy_chunks
+                WHERE organization_id = :org_id
+                  AND embedding IS NOT NULL
+                ORDER BY distance
+                LIMIT :limit
+            )
             SELECT
                 id,
                 policy_document_id,
                 chunk_text,
                 chunk_index,
                 metadata,
-                1 - (embedding <=> CAST(:embedding AS vector)) AS similarity
-            FROM policy_chunks
-            WHERE organization_id = :org_id
-              AND embedding IS NOT NULL
-            ORDER BY embedding <=> CAST(:embedding AS vector)
-            LIMIT :limit
+                1 - distance AS similarity
+            FROM nearest
+            ORDER BY distance
             """
         )
 
-        embedding_str = "[" + ",".join(str(v) for v in query_embedding) + "]"
+        embedding_str = halfvec_literal(query_embedding)
 
         result = await db.execute(
             query,
@@ -35,9 +35,12 @@ from app.models import (
     Organization,
     PolicyDocument,
     User,
+    load_all,
 )
 from app.services.rag.pipeline import RAGPipeline
 
+load_all()
+
 
 # ── Seed Data Definitions ────────────────────────────────────────────────────
 
@@ -25,7 +25,7 @@ export default function DashboardPage() {
       try {
         const [empRes, polRes] = await Promise.all([
           api.get("/v1/employees", { params: { page: 1, page_size: 1 } }),
-          api.get("/v1/policies"),
+          api.get("/v1/policies", { params: { page: 1, page_size: 1 } }),
         ]);
         setStats({
           employeeCount: empRes.data.total ?? 0,
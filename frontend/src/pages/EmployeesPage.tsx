@@ -115,6 +115,7 @@ export default function EmployeesPage() {
 
   // Leave requests state
   const [leaveRequests, setLeaveRequests] = useState<LeaveRequest[]>([]);
+  const [requestsTotal, setRequestsTotal] = useState(0);
   const [requestsLoading, setRequestsLoading] = useState(false);
   const [requestsError, setRequestsError] = useState<string | null>(null);
 
@@ -148,6 +149,7 @@ export default function EmployeesPage() {
     setLeaveBalances([]);
     setBalancesError(null);
     setLeaveRequests([]);
+    setRequestsTotal(0);
     setRequestsError(null);
     fetchEmployeeDetail(employeeId);
   };
@@ -185,9 +187,10 @@ export default function EmployeesPage() {
     setRequestsError(null);
     try {
       const { data } = await api.get("/v1/leave/requests", {
-        params: { employee_id: employeeId },
+        params: { employee_id: employeeId, page_size: 200 },
       });
       setLeaveRequests(data.items ?? []);
+      setRequestsTotal(data.total ?? 0);
     } catch {
       setRequestsError("Failed to load leave requests.");
     } finally {
@@ -489,6 +492,11 @@ export default function EmployeesPage() {
                       )}
                     </div>
                   ))}
+                  {requestsTotal > leaveRequests.length && (
+                    <p className="text-xs text-muted-foreground text-center">
+                      Showing the latest {leaveRequests.length} of {requestsTotal} requests.
+                    </p>
+                  )}
                 </div>
               )}
             </TabsContent>
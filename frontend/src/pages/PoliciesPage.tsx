@@ -16,24 +16,30 @@ import {
 import { ScrollArea } from "@/components/ui/scroll-area";
 import api from "@/lib/api";
 
-interface Policy {
+interface PolicyListItem {
   id: string;
   title: string;
-  content: string;
+  content_preview: string;
   category: string | null;
   is_active: boolean;
   updated_at: string;
 }
 
+interface Policy extends Omit<PolicyListItem, "content_preview"> {
+  content: string;
+}
+
 export default function PoliciesPage() {
-  const [policies, setPolicies] = useState<Policy[]>([]);
+  const [policies, setPolicies] = useState<PolicyListItem[]>([]);
   const [loading, setLoading] = useState(true);
   const [selected, setSelected] = useState<Policy | null>(null);
 
   useEffect(() => {
     async function fetchPolicies() {
       try {
-        const { data } = await api.get("/v1/policies");
+        const { data } = await api.get("/v1/policies", {
+          params: { page_size: 200, include_total: false },
+        });
         setPolicies(data.items);
       } catch {
         // silently handle
@@ -44,6 +50,15 @@ export default function PoliciesPage() {
     fetchPolicies();
   }, []);
 
+  async function openPolicy(id: string) {
+    try {
+      const { data } = await api.get(`/v1/policies/${id}`);
+      setSelected(data);
+    } catch {
+      // silently handle
+    }
+  }
+
   return (
     <div className="space-y-4">
       <div className="flex items-center gap-2">
@@ -62,7 +77,7 @@ export default function PoliciesPage() {
             <Card
               key={policy.id}
               className="cursor-pointer transition-shadow hover:shadow-md"
-              onClick={() => setSelected(policy)}
+              onClick={() => openPolicy(policy.id)}
             >
               <CardHeader>
                 <div className="flex items-start justify-between gap-2">
@@ -78,7 +93,7 @@ export default function PoliciesPage() {
               </CardHeader>
               <CardContent>
                 <p className="text-sm text-muted-foreground line-clamp-3">
-                  {policy.content}
+                  {policy.content_preview}
                 </p>
               </CardContent>
             </Card>